@@ -1000,6 +1000,13 @@ class Agent:
                     logger.warning(f"Error closing MCP server {mcp_server.name}: {e}")
             logger.info("All MCP server connections closed")
 
+        # Close the model provider's connections
+        if getattr(self, "provider", None) is not None:
+            try:
+                await self.provider.aclose()
+            except Exception as e:
+                logger.warning(f"Error closing model provider: {e}")
+
         # Clear provider and kernel references
         self.provider = None
         self.kernel = None
@@ -4,7 +4,7 @@ import json
 import logging
 import os
 import sys
-from datetime import datetime
+from datetime import datetime, timezone
 from enum import Enum
 from pathlib import Path
 from typing import Any, Dict, Optional
@@ -14,7 +14,7 @@ import yaml
 from agently_sdk import styles  # Import styles directly from SDK
 
 from agently.config.parser import load_agent_config
-from agently.plugins.sources import GitHubPluginSource, LocalPluginSource
+from agently.plugins.sources import GitHubPluginSource, LocalPluginSource, prepare_github_sources, write_lockfile
 from agently.utils.logging import LogLevel, configure_logging
 from agently.version import __version__
 
@@ -408,16 +408,20 @@ def _initialize_plugins(config_path, quiet=False, force=False):
     if not lockfile_path.exists():
         logger.info("Creating new lockfile")
         lockfile: Dict[str, Dict[str, Dict[str, Any]]] = {"plugins": {"sk": {}, "mcp": {}}}
-        with open(lockfile_path, "w") as f:
-            json.dump(lockfile, f, indent=2)
+        write_lockfile(lockfile_path, lockfile)
+        lockfile_snapshot = json.dumps(lockfile, indent=2)
     else:
         # Load existing lockfile
         with open(lockfile_path, "r") as f:
             try:
                 lockfile = json.load(f)  # This is safe because we already declared the type above
+                # Remember the contents as read, to skip rewriting an unchanged lockfile
+                lockfile_snapshot = json.dumps(lockfile, indent=2)
             except json.JSONDecodeError:
                 logger.error("Invalid lockfile, creating new one")
                 lockfile = {"plugins": {"sk": {}, "mcp": {}}}
+                # The file on disk must be replaced even if nothing else changes
+                lockfile_snapshot = None
 
         # Ensure the lockfile has the correct structure
         if "plugins" not in lockfile:
@@ -723,7 +727,8 @@ def _initialize_plugins(config_path, quiet=False, force=False):
 
     # Now perform the actual installation
 
-    # Install GitHub plugins
+    # Create the GitHub plugin sources that need installing
+    github_installs = []
     for github_plugin_config in github_plugins:
         repo_url = github_plugin_config["source"]
         version = github_plugin_config.get("version", "main")
@@ -748,7 +753,50 @@ def _initialize_plugins(config_path, quiet=False, force=False):
             installed_plugins.add(plugin_key)
             continue
 
+        github_installs.append((github_plugin_config, source, plugin_key))
+
+    # Same for GitHub MCP servers
+    github_mcp_installs = []
+    for github_mcp_config in github_mcp_servers:
+        repo_url = github_mcp_config["source"]
+        version = github_mcp_config.get("version", "main")
+        server_path = github_mcp_config.get("server_path", "")
+        name = github_mcp_config.get("name", "")
+
+        # Create a GitHubPluginSource for the MCP server
+        source = GitHubPluginSource(
+            repo_url=repo_url,
+            plugin_path=server_path,
+            namespace="",  # Will be extracted from repo_url
+            name=name if name else "",  # Use provided name or extract from repo_url
+            version=version,
+            force_reinstall=force,
+            cache_dir=Path.cwd() / ".agently" / "plugins" / "mcp",
+            plugin_type="mcp",  # Specify that this is an MCP server
+        )
+
+        mcp_key = f"{source.namespace}/{source.name}"
+
+        # Skip if unchanged and not forced
+        if mcp_key in mcp_unchanged and not force:
+            installed_mcp_servers.add(mcp_key)
+            continue
+
+        github_mcp_installs.append((github_mcp_config, source, mcp_key))
+
+    # Clone or update all the repositories concurrently before installing them one by one
+    prepare_errors = prepare_github_sources([source for _, source, _ in github_installs + github_mcp_installs])
+    github_errors = prepare_errors[: len(github_installs)]
+    github_mcp_errors = prepare_errors[len(github_installs) :]
+
+    # Install GitHub plugins
+    for (github_plugin_config, source, plugin_key), prepare_error in zip(github_installs, github_errors):
+        repo_url = github_plugin_config["source"]
+
         try:
+            if prepare_error:
+                raise prepare_error
+
             # Load plugin
             plugin_class = source.load()
 
@@ -816,42 +864,23 @@ def _initialize_plugins(config_path, quiet=False, force=False):
                 click.echo(f"{styles.red('✗')} Failed to install {plugin_key}: {e}")
 
     # Install GitHub MCP servers
-    for github_mcp_config in github_mcp_servers:
+    for (github_mcp_config, source, mcp_key), prepare_error in zip(github_mcp_installs, github_mcp_errors):
         repo_url = github_mcp_config["source"]
         version = github_mcp_config.get("version", "main")
         server_path = github_mcp_config.get("server_path", "")
-        name = github_mcp_config.get("name", "")
         command = github_mcp_config.get("command", "")
         args = github_mcp_config.get("args", [])
         description = github_mcp_config.get("description", "")
         variables = github_mcp_config.get("variables", {})
 
-        # Create a GitHubPluginSource for the MCP server
-        source = GitHubPluginSource(
-            repo_url=repo_url,
-            plugin_path=server_path,
-            namespace="",  # Will be extracted from repo_url
-            name=name if name else "",  # Use provided name or extract from repo_url
-            version=version,
-            force_reinstall=force,
-            cache_dir=Path.cwd() / ".agently" / "plugins" / "mcp",
-            plugin_type="mcp",  # Specify that this is an MCP server
-        )
-
-        mcp_key = f"{source.namespace}/{source.name}"
-
-        # Skip if unchanged and not forced
-        if mcp_key in mcp_unchanged and not force:
-            installed_mcp_servers.add(mcp_key)
-            continue
-
         try:
             # For MCP servers, we don't need to load a plugin class
-            # We just need to clone/update the repository
-            source._clone_or_update_repo(source.cache_dir / source.name)
+            # We just need the repository, which prepare_github_sources cloned or updated
+            if prepare_error:
+                raise prepare_error
 
             # Get current timestamp in ISO format
-            current_time = datetime.utcnow().isoformat()
+            current_time = datetime.now(timezone.utc).isoformat()
 
             # Get the MCP server directory
             mcp_dir = source.cache_dir / source.name
@@ -914,7 +943,7 @@ def _initialize_plugins(config_path, quiet=False, force=False):
             mcp_servers_dir.mkdir(parents=True, exist_ok=True)
 
             # Get current timestamp in ISO format
-            current_time = datetime.utcnow().isoformat()
+            current_time = datetime.now(timezone.utc).isoformat()
 
             # For local MCP servers with source files, calculate a SHA
             plugin_sha = ""
@@ -972,9 +1001,11 @@ def _initialize_plugins(config_path, quiet=False, force=False):
         # MCP servers are removed silently
         lockfile["plugins"]["mcp"].pop(mcp_key, None)
 
-    # Write updated lockfile
-    with open(lockfile_path, "w") as f:
-        json.dump(lockfile, f, indent=2)
+    # Write updated lockfile, unless nothing was installed, updated or removed
+    if json.dumps(lockfile, indent=2) != lockfile_snapshot:
+        write_lockfile(lockfile_path, lockfile)
+    else:
+        logger.debug("Lockfile unchanged, skipping write")
 
     # Check if there were any failures
     if failed and not quiet:
@@ -80,68 +80,72 @@ async def _run_interactive_loop(agent_config: AgentConfig):
     await agent.initialize()
     logger.info("Agent initialized successfully")
 
-    # Create conversation context
-    context = ConversationContext(conversation_id=f"cli-{agent_config.id}")
-    logger.debug(f"Created conversation context with ID: {context.id}")
-
-    # Construct a simplified welcome message
-    provider = agent_config.model.provider if hasattr(agent_config.model, "provider") else "unknown"
-    model_name = agent_config.model.model if hasattr(agent_config.model, "model") else str(agent_config.model)
-
-    # Enter interactive context for proper streaming
-    with cli.enter_context("interactive"):
-        # Welcome message with minimal but informative details
-        cli.echo(f"\nThe agent {agent_config.name} has been initialized using {provider} {model_name}")
-        if agent_config.description:
-            cli.echo(agent_config.description)
-
-        cli.muted("\nType a message to begin. Type exit to quit.\n")
-
-        # Main loop
-        while True:
-            try:
-                # Get user input
-                user_input = click.prompt("You", prompt_suffix="> ")
-                logger.debug(f"User input: {user_input}")
-
-                # Check for exit
-                if user_input.lower() in ["exit", "quit"]:
-                    logger.info("User requested exit")
+    try:
+        # Create conversation context
+        context = ConversationContext(conversation_id=f"cli-{agent_config.id}")
+        logger.debug(f"Created conversation context with ID: {context.id}")
+
+        # Construct a simplified welcome message
+        provider = agent_config.model.provider if hasattr(agent_config.model, "provider") else "unknown"
+        model_name = agent_config.model.model if hasattr(agent_config.model, "model") else str(agent_config.model)
+
+        # Enter interactive context for proper streaming
+        with cli.enter_context("interactive"):
+            # Welcome message with minimal but informative details
+            cli.echo(f"\nThe agent {agent_config.name} has been initialized using {provider} {model_name}")
+            if agent_config.description:
+                cli.echo(agent_config.description)
+
+            cli.muted("\nType a message to begin. Type exit to quit.\n")
+
+            # Main loop
+            while True:
+                try:
+                    # Get user input
+                    user_input = click.prompt("You", prompt_suffix="> ")
+                    logger.debug(f"User input: {user_input}")
+
+                    # Check for exit
+                    if user_input.lower() in ["exit", "quit"]:
+                        logger.info("User requested exit")
+                        break
+
+                    # Process message
+                    logger.info(f"Processing user message: {user_input[:50]}...")
+                    message = Message(content=user_input, role="user")
+
+                    # Reset the function state before processing the message
+                    cli.reset_function_state()
+
+                    # Display the prompt with newline before but not after
+                    cli.echo("\nAssistant> ", nl=False)
+
+                    # For storing response chunks for history
+                    response_chunks = []
+
+                    async for chunk in agent.process_message(message, context):
+                        # Store the chunk for history
+                        if chunk:
+                            response_chunks.append(chunk)
+                            # Display the chunk immediately using the output manager
+                            cli.stream(chunk)
+
+                    # Add a newline after the response
+                    cli.echo("")
+
+                    response_text = "".join(response_chunks)
+                    logger.debug(f"Agent response complete: {len(response_text)} chars")
+
+                except KeyboardInterrupt:
+                    logger.info("User interrupted with Ctrl+C")
+                    cli.echo("\nExiting...")
                     break
+                except Exception as e:
+                    logger.exception(f"Error in interactive loop: {e}")
+                    cli.echo(f"\nError: {e}")
 
-                # Process message
-                logger.info(f"Processing user message: {user_input[:50]}...")
-                message = Message(content=user_input, role="user")
-
-                # Reset the function state before processing the message
-                cli.reset_function_state()
-
-                # Display the prompt with newline before but not after
-                cli.echo("\nAssistant> ", nl=False)
-
-                # For storing response chunks for history
-                response_chunks = []
-
-                async for chunk in agent.process_message(message, context):
-                    # Store the chunk for history
-                    if chunk:
-                        response_chunks.append(chunk)
-                        # Display the chunk immediately using the output manager
-                        cli.stream(chunk)
-
-                # Add a newline after the response
-                cli.echo("")
-
-                response_text = "".join(response_chunks)
-                logger.debug(f"Agent response complete: {len(response_text)} chars")
-
-            except KeyboardInterrupt:
-                logger.info("User interrupted with Ctrl+C")
-                cli.echo("\nExiting...")
-                break
-            except Exception as e:
-                logger.exception(f"Error in interactive loop: {e}")
-                cli.echo(f"\nError: {e}")
+    finally:
+        await agent.close()
 
 
 def interactive_loop(agent_config: AgentConfig):
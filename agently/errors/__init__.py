@@ -9,8 +9,11 @@ from .types import (
     ErrorContext,
     ErrorSeverity,
     ModelError,
+    PermanentModelError,
     PluginError,
+    RateLimitError,
     SecurityError,
+    TransientModelError,
 )
 
 __all__ = [
@@ -22,6 +25,9 @@ __all__ = [
     "AgentError",
     "PluginError",
     "ModelError",
+    "TransientModelError",
+    "PermanentModelError",
+    "RateLimitError",
     "ConversationError",
     "SecurityError",
     # Error handling
@@ -140,7 +140,10 @@ class RetryHandler(Generic[T, R]):
     async def retry_generator(
         self, operation: Callable[[], AsyncGenerator[R, None]], context: ErrorContext
     ) -> AsyncGenerator[R, None]:
-        """Retry an async generator operation with exponential backoff."""
+        """Retry an async generator operation with exponential backoff.
+
+        Errors with ``retryable = False`` are re-raised immediately.
+        """
         last_error = None
 
         for attempt in range(self.config.max_attempts):
@@ -149,10 +152,12 @@ class RetryHandler(Generic[T, R]):
                     yield item
                 return
             except Exception as e:
+                if not getattr(e, "retryable", True):
+                    raise
                 last_error = e
 
                 if attempt + 1 < self.config.max_attempts:
-                    delay = self._calculate_delay(attempt)
+                    delay = self._calculate_delay(attempt, e)
                     logger.warning(
                         f"Retry attempt {attempt + 1} failed, " f"retrying in {delay:.2f}s",
                         extra={"context": context.__dict__},
@@ -169,17 +174,22 @@ class RetryHandler(Generic[T, R]):
         )
 
     async def retry(self, operation: Callable[[], Awaitable[R]], context: ErrorContext) -> R:
-        """Retry an async operation with exponential backoff."""
+        """Retry an async operation with exponential backoff.
+
+        Errors with ``retryable = False`` are re-raised immediately.
+        """
         last_error = None
 
         for attempt in range(self.config.max_attempts):
             try:
                 return await operation()
             except Exception as e:
+                if not getattr(e, "retryable", True):
+                    raise
                 last_error = e
 
                 if attempt + 1 < self.config.max_attempts:
-                    delay = self._calculate_delay(attempt)
+                    delay = self._calculate_delay(attempt, e)
                     logger.warning(
                         f"Retry attempt {attempt + 1} failed, " f"retrying in {delay:.2f}s",
                         extra={"context": context.__dict__},
@@ -195,8 +205,16 @@ class RetryHandler(Generic[T, R]):
             cause=last_error,
         )
 
-    def _calculate_delay(self, attempt: int) -> float:
-        """Calculate delay for next retry attempt."""
+    def _calculate_delay(self, attempt: int, error: Optional[BaseException] = None) -> float:
+        """Calculate delay for next retry attempt.
+
+        A ``retry_after`` hint on the error (e.g. from a Retry-After header)
+        takes precedence over exponential backoff, capped at ``max_delay``.
+        """
+        retry_after = getattr(error, "retry_after", None)
+        if retry_after is not None:
+            return min(max(retry_after, 0.0), self.config.max_delay)
+
         delay = min(
             self.config.initial_delay * (self.config.exponential_base**attempt),
             self.config.max_delay,
@@ -131,6 +131,37 @@ class ModelError(AgentRuntimeError):
         )
 
 
+class TransientModelError(ModelError):
+    """Raised for model provider failures that may succeed if retried."""
+
+
+class PermanentModelError(ModelError):
+    """Raised for model provider failures that retrying cannot fix."""
+
+    # Checked by RetryHandler to give up without further attempts
+    retryable = False
+
+
+class RateLimitError(TransientModelError):
+    """Raised when a model provider asks the client to back off."""
+
+    def __init__(
+        self,
+        message: str,
+        context: Optional[ErrorContext] = None,
+        recovery_hint: Optional[str] = None,
+        cause: Optional[Exception] = None,
+        retry_after: Optional[float] = None,
+    ):
+        super().__init__(
+            message,
+            context,
+            recovery_hint or "Wait before retrying or reduce request volume",
+            cause,
+        )
+        self.retry_after = retry_after
+
+
 class ConversationError(AgentRuntimeError):
     """Raised when there is an error in conversation processing."""
 
@@ -7,6 +7,7 @@ interactions with various AI models and provides error handling capabilities.
 from abc import ABC, abstractmethod
 from typing import Any, AsyncIterator
 
+import numpy as np
 from semantic_kernel.contents import ChatHistory
 
 from agently.core import get_error_handler
@@ -16,10 +17,12 @@ from agently.errors import ErrorContext, ModelError, RetryConfig, RetryHandler
 class ModelProvider(ABC):
     """Base class for model providers."""
 
+    __slots__ = ("error_handler", "retry_handler")
+
     def __init__(self):
         self.error_handler = get_error_handler()
         self.retry_handler: RetryHandler[Any, Any] = RetryHandler(
-            RetryConfig(max_attempts=3, initial_delay=1.0, max_delay=10.0)
+            RetryConfig(max_attempts=3, initial_delay=1.0, max_delay=10.0, jitter=0.5)
         )
 
     @abstractmethod
@@ -27,8 +30,11 @@ class ModelProvider(ABC):
         """Process a chat message and return response chunks."""
 
     @abstractmethod
-    async def get_embeddings(self, text: str) -> list[float]:
-        """Get embeddings for text."""
+    async def get_embeddings(self, text: str) -> np.ndarray:
+        """Get embeddings for text as a float32 array."""
+
+    async def aclose(self) -> None:
+        """Release connections held by the provider."""
 
     async def _handle_api_call(self, operation_name: str, **context_details) -> ErrorContext:
         """Create error context for API calls."""
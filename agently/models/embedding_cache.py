@@ -0,0 +1,268 @@
+"""Content-addressed cache for embedding vectors.
+
+Vectors are keyed by a hash of the model name and the input text, so the
+same text embedded with the same model is only ever sent to the provider
+once. Entries are kept in SQLite, either in memory or in a file so that they
+survive restarts.
+"""
+
+import asyncio
+import hashlib
+import logging
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+try:
+    from blake3 import blake3 as _blake3
+except ImportError:  # pragma: no cover - optional dependency
+    _blake3 = None
+
+logger = logging.getLogger(__name__)
+
+# Stay well below SQLite's limit on bound parameters per statement
+_MAX_QUERY_KEYS = 500
+
+# Entries kept before the oldest are evicted, unless OLLAMA_EMBED_CACHE_MAX_ENTRIES says otherwise
+_DEFAULT_MAX_ENTRIES = 10_000
+
+
+def embedding_cache_key(model: str, text: str) -> bytes:
+    """Compute the cache key for a (model, text) pair.
+
+    Uses BLAKE3 when the ``blake3`` package is installed and BLAKE2b otherwise.
+
+    Args:
+        model: Name of the embedding model
+        text: Text being embedded
+
+    Returns:
+        A 32-byte digest identifying the pair
+    """
+    data = f"{model}\0{text}".encode()
+    if _blake3 is not None:
+        return _blake3(data).digest()
+    return hashlib.blake2b(data, digest_size=32).digest()
+
+
+class EmbeddingCache:
+    """SQLite-backed store of embedding vectors keyed by content hash.
+
+    The store holds at most ``max_entries`` vectors; the oldest are evicted
+    first. Expired entries are deleted as they are found and whenever new
+    vectors are stored.
+    """
+
+    def __init__(self, path: str = ":memory:", ttl: Optional[float] = None, max_entries: Optional[int] = None):
+        """Initialize the cache.
+
+        Args:
+            path: SQLite database path, or ":memory:" for a process-local cache
+            ttl: Seconds after which entries expire, or None to keep them forever
+            max_entries: Most entries to keep, or None for the default limit
+
+        Raises:
+            OSError: If the database directory can't be created
+            sqlite3.Error: If the database can't be opened
+        """
+        self.in_memory = path == ":memory:"
+        if not self.in_memory:
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+
+        self.ttl = ttl
+        self.max_entries = _DEFAULT_MAX_ENTRIES if max_entries is None else max_entries
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        if not self.in_memory:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS embeddings (key BLOB PRIMARY KEY, vector BLOB NOT NULL, created_at REAL NOT NULL)"
+        )
+        # Eviction and expiry both walk entries by age
+        self._conn.execute("CREATE INDEX IF NOT EXISTS embeddings_created_at ON embeddings (created_at)")
+
+        # Upper bound on the number of rows; replacing an existing key counts as an insert
+        self._size_estimate = self._conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+
+    @classmethod
+    def from_env(cls) -> "EmbeddingCache":
+        """Create a cache configured from environment variables.
+
+        ``OLLAMA_EMBED_CACHE`` sets the database path (in-memory when unset),
+        ``OLLAMA_EMBED_CACHE_TTL`` sets the entry lifetime in seconds and
+        ``OLLAMA_EMBED_CACHE_MAX_ENTRIES`` sets the number of entries kept.
+
+        Returns:
+            The configured cache
+
+        Raises:
+            ValueError: If the TTL or entry limit isn't a number
+            OSError: If the database directory can't be created
+            sqlite3.Error: If the database can't be opened
+        """
+        path = os.getenv("OLLAMA_EMBED_CACHE")
+        ttl = os.getenv("OLLAMA_EMBED_CACHE_TTL")
+        max_entries = os.getenv("OLLAMA_EMBED_CACHE_MAX_ENTRIES")
+        return cls(
+            path=os.path.expanduser(path) if path else ":memory:",
+            ttl=float(ttl) if ttl else None,
+            max_entries=int(max_entries) if max_entries else None,
+        )
+
+    def get(self, key: bytes) -> Optional[np.ndarray]:
+        """Look up a vector by key.
+
+        Args:
+            key: Cache key from embedding_cache_key
+
+        Returns:
+            The cached vector, or None on a miss or expired entry
+        """
+        return self.get_many([key]).get(key)
+
+    def get_many(self, keys: Sequence[bytes]) -> Dict[bytes, np.ndarray]:
+        """Look up several vectors at once, deleting any expired ones found.
+
+        Args:
+            keys: Cache keys from embedding_cache_key
+
+        Returns:
+            Dictionary of the keys that were found, mapped to their vectors
+        """
+        rows = []
+        with self._lock:
+            for i in range(0, len(keys), _MAX_QUERY_KEYS):
+                chunk = keys[i : i + _MAX_QUERY_KEYS]
+                placeholders = ",".join("?" * len(chunk))
+                rows.extend(
+                    self._conn.execute(
+                        f"SELECT key, vector, created_at FROM embeddings WHERE key IN ({placeholders})", chunk
+                    ).fetchall()
+                )
+
+        now = time.time()
+        found: Dict[bytes, np.ndarray] = {}
+        expired = []
+        for key, vector, created_at in rows:
+            if self.ttl is not None and now - created_at >= self.ttl:
+                expired.append((key,))
+                continue
+            found[key] = np.frombuffer(vector, dtype=np.float32).copy()
+
+        if expired:
+            with self._lock:
+                self._conn.executemany("DELETE FROM embeddings WHERE key = ?", expired)
+        return found
+
+    def put(self, key: bytes, vector: Sequence[float]) -> None:
+        """Store a vector under a key.
+
+        Vectors are stored as packed float32 values.
+
+        Args:
+            key: Cache key from embedding_cache_key
+            vector: Embedding values
+        """
+        self.put_many([(key, vector)])
+
+    def put_many(self, items: Iterable[Tuple[bytes, Sequence[float]]]) -> None:
+        """Store several vectors, then drop expired entries and evict the oldest beyond the limit.
+
+        Args:
+            items: (key, vector) pairs, with keys from embedding_cache_key
+        """
+        now = time.time()
+        rows = [(key, np.asarray(vector, dtype=np.float32).tobytes(), now) for key, vector in items]
+        with self._lock:
+            self._conn.executemany("INSERT OR REPLACE INTO embeddings (key, vector, created_at) VALUES (?, ?, ?)", rows)
+            if self.ttl is not None:
+                self._conn.execute("DELETE FROM embeddings WHERE created_at <= ?", (now - self.ttl,))
+                self._size_estimate = self._conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+            else:
+                self._size_estimate += len(rows)
+
+            # Only count exactly once the estimate says the limit may be exceeded
+            if self._size_estimate > self.max_entries:
+                self._size_estimate = self._conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+                excess = self._size_estimate - self.max_entries
+                if excess > 0:
+                    self._conn.execute(
+                        "DELETE FROM embeddings WHERE key IN (SELECT key FROM embeddings ORDER BY created_at LIMIT ?)",
+                        (excess,),
+                    )
+                    self._size_estimate = self.max_entries
+
+    async def _call(self, func: Callable[..., Any], *args: Any) -> Any:
+        """Run a database call without blocking the event loop on file I/O.
+
+        A file-backed database is queried in a worker thread. The in-memory
+        store never touches the disk, so its calls run inline, where they are
+        cheaper than the thread hand-off.
+
+        Args:
+            func: Cache method to call
+            *args: Arguments for the method
+
+        Returns:
+            The method's result
+        """
+        if self.in_memory:
+            return func(*args)
+        return await asyncio.to_thread(func, *args)
+
+    async def get_or_compute(
+        self, model: str, text: str, compute: Callable[[str], Awaitable[Sequence[float]]]
+    ) -> np.ndarray:
+        """Return the cached vector for a text, computing and storing it on a miss.
+
+        Args:
+            model: Name of the embedding model
+            text: Text to get embeddings for
+            compute: Coroutine function that embeds the text on a miss
+
+        Returns:
+            Embedding values as a float32 array
+        """
+        key = embedding_cache_key(model, text)
+        vector = await self._call(self.get, key)
+        if vector is not None:
+            logger.debug("Embedding cache hit")
+            return vector
+
+        vector = np.asarray(await compute(text), dtype=np.float32)
+        await self._call(self.put, key, vector)
+        return vector
+
+    async def get_or_compute_many(
+        self,
+        model: str,
+        texts: Sequence[str],
+        compute_many: Callable[[List[str]], Awaitable[Sequence[Sequence[float]]]],
+    ) -> List[np.ndarray]:
+        """Return vectors for several texts, computing only the cache misses.
+
+        Args:
+            model: Name of the embedding model
+            texts: Texts to get embeddings for
+            compute_many: Coroutine function that embeds a list of unique texts
+
+        Returns:
+            Float32 embedding arrays for each text, in input order
+        """
+        keys = {text: embedding_cache_key(model, text) for text in texts}
+        found = await self._call(self.get_many, list(keys.values()))
+        vectors = {text: found[key] for text, key in keys.items() if key in found}
+
+        missing = [text for text in keys if text not in vectors]
+        if missing:
+            logger.debug(f"Embedding cache hit for {len(vectors)} of {len(keys)} texts")
+            for text, vector in zip(missing, await compute_many(missing)):
+                vectors[text] = np.asarray(vector, dtype=np.float32)
+            await self._call(self.put_many, [(keys[text], vectors[text]) for text in missing])
+
+        return [vectors[text] for text in texts]
@@ -12,8 +12,11 @@ import json
 import logging
 import os
 import re
-from typing import Any, AsyncIterator, Dict, List, Optional, Set, Tuple, TypeVar
+import sqlite3
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional, Sequence, Set, Tuple, TypeVar
 
+import aiohttp
+import numpy as np
 from ollama import AsyncClient
 from semantic_kernel import Kernel
 from semantic_kernel.connectors.ai.ollama.ollama_prompt_execution_settings import OllamaChatPromptExecutionSettings
@@ -26,6 +29,8 @@ from agently.config.types import ModelConfig
 from agently.errors import ModelError
 
 from .base import ModelProvider
+from .embedding_cache import EmbeddingCache, embedding_cache_key
+from .ollama_embeddings import post_embedding
 
 logger = logging.getLogger(__name__)
 T = TypeVar("T")
@@ -33,9 +38,149 @@ T = TypeVar("T")
 # mypy: ignore-errors
 
 
+class _EmbedBatcher:
+    """Coalesce embedding requests that arrive within a short window.
+
+    Requests submitted while a window is open are gathered and dispatched
+    together once the window closes or the batch is full. Duplicate texts
+    within a batch share a single request.
+    """
+
+    __slots__ = ("_fetch", "_max_wait", "_max_batch", "pending", "_full", "_task")
+
+    def __init__(
+        self,
+        fetch: Callable[[str], Awaitable[Sequence[float]]],
+        max_wait: float = 0.005,
+        max_batch: int = 32,
+    ):
+        """Initialize the batcher.
+
+        Args:
+            fetch: Coroutine function that embeds a single text
+            max_wait: Seconds to wait for more requests before dispatching
+            max_batch: Number of pending requests that triggers an early dispatch
+        """
+        self._fetch = fetch
+        self._max_wait = max_wait
+        self._max_batch = max_batch
+        self.pending: List[Tuple[str, asyncio.Future]] = []
+        self._full: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+
+    async def submit(self, text: str) -> Sequence[float]:
+        """Queue a text for embedding and wait for its result.
+
+        Args:
+            text: Text to get embeddings for
+
+        Returns:
+            List of embedding values
+        """
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+
+        # Start a new window lazily; a task left over from a closed loop is discarded, along with
+        # requests still waiting on that loop, which could never receive their results
+        if self._task is None or self._task.get_loop() is not loop:
+            self.pending = [(queued, waiter) for queued, waiter in self.pending if waiter.get_loop() is loop]
+            self._open_window(loop)
+
+        self.pending.append((text, future))
+        if len(self.pending) >= self._max_batch:
+            self._full.set()
+
+        return await future
+
+    def _open_window(self, loop: asyncio.AbstractEventLoop) -> None:
+        """Start collecting requests for the next dispatch.
+
+        Args:
+            loop: The running event loop
+        """
+        self._full = asyncio.Event()
+        self._task = loop.create_task(self._flush_after_window())
+        if len(self.pending) >= self._max_batch:
+            self._full.set()
+
+    async def submit_many(self, texts: List[str]) -> List[Sequence[float]]:
+        """Queue several texts for embedding and wait for all results.
+
+        Args:
+            texts: Texts to get embeddings for
+
+        Returns:
+            Embedding values for each text, in input order
+        """
+        return list(await asyncio.gather(*(self.submit(text) for text in texts)))
+
+    async def _flush_after_window(self) -> None:
+        """Wait for the window to close, then dispatch up to max_batch pending requests.
+
+        Requests beyond max_batch stay pending for the next window.
+        """
+        try:
+            await asyncio.wait_for(self._full.wait(), self._max_wait)
+        except asyncio.TimeoutError:
+            pass
+
+        batch, self.pending = self.pending[: self._max_batch], self.pending[self._max_batch :]
+        self._task = None
+        if self.pending:
+            self._open_window(asyncio.get_running_loop())
+        await self._dispatch(batch)
+
+    async def _dispatch(self, batch: List[Tuple[str, asyncio.Future]]) -> None:
+        """Embed each unique text in the batch and resolve the waiting futures.
+
+        Args:
+            batch: Pending (text, future) pairs
+        """
+        waiters: Dict[str, List[asyncio.Future]] = {}
+        for text, future in batch:
+            waiters.setdefault(text, []).append(future)
+
+        results = await asyncio.gather(*(self._fetch(text) for text in waiters), return_exceptions=True)
+
+        for futures, result in zip(waiters.values(), results):
+            for future in futures:
+                if future.done():
+                    continue
+                try:
+                    if isinstance(result, BaseException):
+                        future.set_exception(result)
+                    else:
+                        future.set_result(result)
+                except RuntimeError:
+                    # The waiter's event loop has closed; the others in the batch still get their results
+                    logger.debug("Dropped embedding result for a request from a closed event loop")
+
+
 class OllamaProvider(ModelProvider):
     """Ollama implementation of the model provider."""
 
+    __slots__ = (
+        "config",
+        "kernel",
+        "ollama_client",
+        "client",
+        "service_id",
+        "_api_url",
+        "_embeddings_url",
+        "_embed_batcher",
+        "_embed_cache",
+        "_inflight",
+        "_session",
+        "_session_loop",
+        "_embed_semaphore",
+        "_embed_concurrency",
+        "_embed_min_interval",
+        "_embed_next_slot",
+    )
+
+    # Matches a function call such as "greet(name='Ada')" in streamed content
+    _FUNCTION_CALL_PATTERN = re.compile(r"(\w+)\s*\((.*?)\)")
+
     def __init__(self, config: ModelConfig):
         """Initialize the Ollama provider.
 
@@ -49,6 +194,10 @@ class OllamaProvider(ModelProvider):
         # Get base URL from environment or use default
         base_url = os.getenv("OLLAMA_BASE_URL", "http://localhost:11434")
 
+        # Resolve the REST endpoints once rather than on every request
+        self._api_url = f"{base_url.rstrip('/')}/api"
+        self._embeddings_url = f"{self._api_url}/embeddings"
+
         # Create the Ollama AsyncClient
         self.ollama_client = AsyncClient(host=base_url)
 
@@ -57,6 +206,33 @@ class OllamaProvider(ModelProvider):
         self.client = OllamaChatCompletion(ai_model_id=self.config.model)
         self.service_id = "ollama"
 
+        # Coalesces back-to-back embedding requests into batched dispatches
+        self._embed_batcher = _EmbedBatcher(self._fetch_embedding_once)
+
+        # Embedding requests currently on the wire, keyed by (model, text) content hash
+        self._inflight: Dict[bytes, asyncio.Task] = {}
+
+        # Previously computed embeddings, keyed by (model, text) content hash; a bad
+        # cache setting shouldn't stop the provider from starting, so run without one
+        self._embed_cache: Optional[EmbeddingCache]
+        try:
+            self._embed_cache = EmbeddingCache.from_env()
+        except (ValueError, OSError, sqlite3.Error) as e:
+            logger.warning(f"Embedding cache disabled, invalid configuration: {e}")
+            self._embed_cache = None
+
+        # HTTP session for embedding requests, created lazily on first use
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._session_loop: Optional[asyncio.AbstractEventLoop] = None
+
+        # Bound in-flight embedding requests so bursts queue here instead of overloading the server
+        self._embed_concurrency = int(os.getenv("OLLAMA_EMBED_CONCURRENCY", "4"))
+        self._embed_semaphore: Optional[asyncio.Semaphore] = None
+
+        # Optional minimum spacing between embedding requests, in seconds
+        self._embed_min_interval = float(os.getenv("OLLAMA_EMBED_MIN_INTERVAL", "0"))
+        self._embed_next_slot = 0.0
+
         logger.debug(f"Initialized Ollama provider with model: {self.config.model}")
 
     def register_kernel(self, kernel: Kernel):
@@ -68,6 +244,65 @@ class OllamaProvider(ModelProvider):
         self.kernel = kernel
         logger.debug("Kernel registered with Ollama provider")
 
+    def _get_session(self) -> aiohttp.ClientSession:
+        """Get the shared HTTP session, creating it for the running event loop if needed.
+
+        Returns:
+            A client session with keep-alive connection pooling
+        """
+        loop = asyncio.get_running_loop()
+        if self._session is None or self._session.closed or self._session_loop is not loop:
+            self._release_session()
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=32, limit_per_host=32, keepalive_timeout=60, ttl_dns_cache=300),
+                timeout=aiohttp.ClientTimeout(total=120, sock_connect=5),
+            )
+            self._session_loop = loop
+            self._embed_semaphore = asyncio.Semaphore(self._embed_concurrency)
+            self._embed_next_slot = 0.0
+        return self._session
+
+    def _release_session(self) -> None:
+        """Let go of a session opened on another event loop.
+
+        The session is detached from its connection pool, which is closed on
+        the loop that owns it when that loop can still run; a closed loop's
+        connections can only be left for the garbage collector.
+        """
+        session, loop = self._session, self._session_loop
+        self._session = None
+        self._session_loop = None
+        if session is None or session.closed:
+            return
+
+        connector = session.connector
+        session.detach()
+        if connector is not None and loop is not None and not loop.is_closed():
+            loop.call_soon_threadsafe(connector.close)
+
+    async def _wait_for_rate_limit(self) -> None:
+        """Delay until the next request slot when a minimum interval is configured."""
+        if self._embed_min_interval <= 0:
+            return
+
+        now = asyncio.get_running_loop().time()
+        delay = self._embed_next_slot - now
+        # Reserve the slot before sleeping so concurrent callers queue behind it
+        self._embed_next_slot = max(now, self._embed_next_slot) + self._embed_min_interval
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    async def aclose(self) -> None:
+        """Close the shared HTTP session, if one was opened."""
+        if self._session is not None and self._session_loop is not asyncio.get_running_loop():
+            self._release_session()
+            return
+
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+        self._session_loop = None
+
     async def chat(self, history: ChatHistory, **kwargs: Any) -> AsyncIterator[str]:
         """Process a chat message using Ollama's API.
 
@@ -106,6 +341,7 @@ class OllamaProvider(ModelProvider):
 
                     # Get available functions from kernel plugins
                     available_functions, function_tools = self._extract_available_functions()
+                    functions_by_name = self._index_functions_by_name(available_functions)
 
                     # Prepare options with temperature
                     options: Optional[Dict[str, Any]] = None
@@ -122,7 +358,6 @@ class OllamaProvider(ModelProvider):
                     )
 
                     # Process the streaming response
-                    buffer = ""
                     function_results: Dict[str, str] = {}
                     executed_functions: Set[str] = set()
 
@@ -158,14 +393,13 @@ class OllamaProvider(ModelProvider):
 
                             # Process potential function calls in the content
                             processed, result = await self._process_function_call_in_content(
-                                content, buffer, available_functions, function_results, executed_functions
+                                content, functions_by_name, function_results, executed_functions
                             )
 
                             if processed:
                                 if result:
                                     yield result  # type: ignore
                             else:
-                                buffer += content
                                 yield content  # type: ignore
 
                 except Exception as e:
@@ -385,11 +619,27 @@ class OllamaProvider(ModelProvider):
         error_msg = f"I tried to execute the {func_name} function but encountered " f"an error: {str(last_error)}"
         return False, error_msg, last_error
 
+    def _index_functions_by_name(
+        self, available_functions: Dict[str, Tuple[str, str, KernelFunction]]
+    ) -> Dict[str, Tuple[str, KernelFunction]]:
+        """Index available functions by their short (unqualified) name.
+
+        Args:
+            available_functions: Dictionary of available functions
+
+        Returns:
+            Dictionary mapping function names to (function_id, function) tuples.
+            When several plugins expose the same name, the first one wins.
+        """
+        functions_by_name: Dict[str, Tuple[str, KernelFunction]] = {}
+        for function_id, (_, fn_name, function) in available_functions.items():
+            functions_by_name.setdefault(fn_name, (function_id, function))
+        return functions_by_name
+
     async def _process_function_call_in_content(
         self,
         content: str,
-        buffer: str,
-        available_functions: Dict[str, Tuple[str, str, KernelFunction]],
+        functions_by_name: Dict[str, Tuple[str, KernelFunction]],
         function_results: Dict[str, str],
         executed_functions: Set[str],
     ) -> Tuple[bool, Optional[str]]:
@@ -397,8 +647,7 @@ class OllamaProvider(ModelProvider):
 
         Args:
             content: Content to process
-            buffer: Current buffer of text
-            available_functions: Dictionary of available functions
+            functions_by_name: Available functions indexed by short name
             function_results: Dictionary of function results
             executed_functions: Set of already executed function IDs
 
@@ -407,96 +656,58 @@ class OllamaProvider(ModelProvider):
             - Boolean indicating if content was processed as a function call
             - Result string if a function was executed, None otherwise
         """
+        stripped = content.strip()
+
         # Check if the content looks like a function call
         if "(" not in content or ")" not in content:
-            # Special handling for function names without parentheses
-            if content.strip() in ["greet", "hello"] or len(content.strip().split()) == 1:
-                return await self._handle_function_name_only(
-                    content.strip(), available_functions, function_results, executed_functions
-                )
-            return False, None
+            # The model may output just a function name, e.g. "greet"
+            if len(stripped.split()) != 1:
+                return False, None
+            return await self._execute_named_function(
+                stripped, {}, True, functions_by_name, function_results, executed_functions
+            )
 
         # Check if we've already executed this function
-        for func_id, result in function_results.items():
+        for result in function_results.values():
             if result in content:
                 return True, None
 
         # Try to match a function call pattern
-        match = re.search(r"(\w+)\s*\((.*?)\)", content)
+        match = self._FUNCTION_CALL_PATTERN.search(content)
         if not match:
             return False, None
 
         func_name = match.group(1)
         args_str = match.group(2)
 
-        # Find the function in available functions
-        for available_func, (plugin_name, fn_name, function) in available_functions.items():
-            if fn_name == func_name:
-                # Skip if we've already executed this function
-                if available_func in executed_functions:
-                    return True, None
-
-                # Parse arguments
-                args = self._parse_function_arguments(args_str)
-
-                # Add a message if this is a standalone function call
-                result_text = ""
-                if content.strip() == f"{func_name}({args_str})":
-                    result_text = f"I'll execute the {func_name} function for you.\n\n"
-
-                # Execute the function
-                success, result, _ = await self._execute_function_with_retry(function, args, func_name)
-
-                # Store the result and mark as executed
-                if success:
-                    function_results[available_func] = result
-                    executed_functions.add(available_func)
-
-                return True, result_text + result
-
-        # Check if the entire content is just a function call
-        full_content_match = re.match(r"^\s*(\w+)\s*\((.*?)\)\s*$", content.strip())
-        if full_content_match and not buffer.strip():
-            func_name = full_content_match.group(1)
-            args_str = full_content_match.group(2)
-
-            # Find the function in available functions
-            for available_func, (plugin_name, fn_name, function) in available_functions.items():
-                if fn_name == func_name:
-                    # Skip if we've already executed this function
-                    if available_func in executed_functions:
-                        return True, None
+        # Add a message if this is a standalone function call
+        announce = stripped == f"{func_name}({args_str})"
 
-                    # Parse arguments
-                    args = self._parse_function_arguments(args_str)
+        return await self._execute_named_function(
+            func_name,
+            self._parse_function_arguments(args_str),
+            announce,
+            functions_by_name,
+            function_results,
+            executed_functions,
+        )
 
-                    # Add a message indicating we're executing the function
-                    result_text = f"I'll execute the {func_name} function for you.\n\n"
-
-                    # Execute the function
-                    success, result, _ = await self._execute_function_with_retry(function, args, func_name)
-
-                    # Store the result and mark as executed
-                    if success:
-                        function_results[available_func] = result
-                        executed_functions.add(available_func)
-
-                    return True, result_text + result
-
-        return False, None
-
-    async def _handle_function_name_only(
+    async def _execute_named_function(
         self,
-        content: str,
-        available_functions: Dict[str, Tuple[str, str, KernelFunction]],
+        func_name: str,
+        args: Dict[str, Any],
+        announce: bool,
+        functions_by_name: Dict[str, Tuple[str, KernelFunction]],
         function_results: Dict[str, str],
         executed_functions: Set[str],
     ) -> Tuple[bool, Optional[str]]:
-        """Handle cases where the model outputs just a function name.
+        """Execute a function referenced by name in the model output.
 
         Args:
-            content: Content containing just a function name
-            available_functions: Dictionary of available functions
+            func_name: Short name of the function to execute
+            args: Arguments to pass to the function
+            announce: Whether to prefix the result with an execution message
+            functions_by_name: Available functions indexed by short name
             function_results: Dictionary of function results
             executed_functions: Set of already executed function IDs
 
@@ -505,27 +716,27 @@ class OllamaProvider(ModelProvider):
             - Boolean indicating if content was processed as a function call
             - Result string if a function was executed, None otherwise
         """
-        for available_func, (plugin_name, fn_name, function) in available_functions.items():
-            # Check for exact match or close match
-            if fn_name == content or content.startswith(fn_name) or fn_name.startswith(content):
-                # Skip if we've already executed this function
-                if available_func in executed_functions:
-                    return True, None
+        entry = functions_by_name.get(func_name)
+        if entry is None:
+            return False, None
+
+        function_id, function = entry
 
-                # Add a message indicating we're executing the function
-                result_text = f"I'll execute the {fn_name} function for you.\n\n"
+        # Skip if we've already executed this function
+        if function_id in executed_functions:
+            return True, None
 
-                # Execute the function with empty arguments
-                success, result, _ = await self._execute_function_with_retry(function, {}, fn_name)
+        result_text = f"I'll execute the {func_name} function for you.\n\n" if announce else ""
 
-                # Store the result and mark as executed
-                if success:
-                    function_results[available_func] = result
-                    executed_functions.add(available_func)
+        # Execute the function
+        success, result, _ = await self._execute_function_with_retry(function, args, func_name)
 
-                return True, result_text + result
+        # Store the result and mark as executed
+        if success:
+            function_results[function_id] = result
+            executed_functions.add(function_id)
 
-        return False, None
+        return True, result_text + result
 
     def _convert_history_to_messages(self, history: ChatHistory) -> List[Dict[str, str]]:
         """Convert chat history to Ollama message format.
@@ -632,54 +843,71 @@ class OllamaProvider(ModelProvider):
             logger.error(f"Error creating tool for {plugin_name}-{func_name}: {str(e)}", exc_info=True)
             return None
 
-    async def get_embeddings(self, text: str) -> List[float]:
+    async def get_embeddings(self, text: str) -> np.ndarray:
         """Get embeddings for text using Ollama's API.
 
+        Previously computed embeddings are served from the embedding cache.
+        Cache misses arriving within a few milliseconds of each other are
+        batched together before being sent to the server.
+
         Args:
             text: Text to get embeddings for
 
         Returns:
-            List of embedding values
+            Embedding values as a float32 array
 
         Raises:
-            ModelError: For API errors or unexpected issues
+            ModelError: For empty text, API errors or unexpected issues
         """
+        context = await self._handle_api_call("embeddings", model=self.config.model, text=text)
+        if not text or text.isspace():
+            raise ModelError(
+                message="Cannot get embeddings for empty text",
+                context=context,
+                recovery_hint="Provide non-empty text to embed",
+            )
+
         try:
-            context = await self._handle_api_call("embeddings", model=self.config.model, text=text)
+            if self._embed_cache is None:
+                return np.asarray(await self._embed_batcher.submit(text), dtype=np.float32)
+            return await self._embed_cache.get_or_compute(self.config.model, text, self._embed_batcher.submit)
+        except Exception as e:
+            raise ModelError(
+                message=f"Failed to get embeddings: {str(e)}",
+                context=context,
+                recovery_hint="Check Ollama server status and model availability",
+                cause=e,
+            )
 
-            # Use the Ollama API directly for embeddings since SK doesn't have a convenient method
+    async def get_embeddings_batch(self, texts: List[str]) -> List[np.ndarray]:
+        """Get embeddings for several texts using Ollama's API.
 
-            import aiohttp
+        Cached texts are served locally and only the remaining unique texts
+        are dispatched, concurrently, through the embedding batcher.
 
-            async def _make_request() -> List[float]:
-                try:
-                    base_url = os.getenv("OLLAMA_BASE_URL", "http://localhost:11434")
-                    api_url = f"{base_url}/api"
-
-                    async with aiohttp.ClientSession() as session:
-                        async with session.post(
-                            f"{api_url}/embeddings",
-                            json={"model": self.config.model, "prompt": text},
-                        ) as response:
-                            if response.status != 200:
-                                error_text = await response.text()
-                                raise ModelError(
-                                    message=f"Ollama API error getting embeddings: {error_text}",
-                                    context=context,
-                                    recovery_hint="Check Ollama server status and model availability",
-                                )
+        Args:
+            texts: Texts to get embeddings for
 
-                            result = await response.json()
-                            return result.get("embedding", [0.0] * 10)  # Return embeddings or fallback
-                except Exception as e:
-                    raise ModelError(
-                        message=f"Ollama API error getting embeddings: {str(e)}",
-                        context=context,
-                        recovery_hint="Check Ollama server status and model availability",
-                        cause=e,
-                    )
+        Returns:
+            Float32 embedding arrays for each text, in input order
 
-            return await self.retry_handler.retry(_make_request, context)
+        Raises:
+            ModelError: If any text is empty, or for API errors or unexpected issues
+        """
+        context = await self._handle_api_call("embeddings_batch", model=self.config.model, count=len(texts))
+        empty = [i for i, text in enumerate(texts) if not text or text.isspace()]
+        if empty:
+            raise ModelError(
+                message=f"Cannot get embeddings for empty text at positions {empty}",
+                context=context,
+                recovery_hint="Remove empty strings before requesting embeddings",
+            )
+
+        try:
+            if self._embed_cache is None:
+                vectors = await self._embed_batcher.submit_many(texts)
+                return [np.asarray(vector, dtype=np.float32) for vector in vectors]
+            return await self._embed_cache.get_or_compute_many(self.config.model, texts, self._embed_batcher.submit_many)
         except Exception as e:
             raise ModelError(
                 message=f"Failed to get embeddings: {str(e)}",
@@ -687,3 +915,52 @@ class OllamaProvider(ModelProvider):
                 recovery_hint="Check Ollama server status and model availability",
                 cause=e,
             )
+
+    async def _fetch_embedding_once(self, text: str) -> np.ndarray:
+        """Fetch embeddings for a text, sharing the request with concurrent callers.
+
+        A caller asking for a text that is already being fetched awaits the
+        existing request instead of sending a duplicate. Cancelling one waiter
+        does not cancel the shared request.
+
+        Args:
+            text: Text to get embeddings for
+
+        Returns:
+            Embedding values as a float32 array
+        """
+        key = embedding_cache_key(self.config.model, text)
+        loop = asyncio.get_running_loop()
+
+        task = self._inflight.get(key)
+        if task is None or task.get_loop() is not loop:
+            task = loop.create_task(self._fetch_embedding(text))
+            self._inflight[key] = task
+
+            def _forget(done: asyncio.Task) -> None:
+                if self._inflight.get(key) is done:
+                    del self._inflight[key]
+
+            task.add_done_callback(_forget)
+
+        return await asyncio.shield(task)
+
+    async def _fetch_embedding(self, text: str) -> np.ndarray:
+        """Request embeddings for a single text from Ollama, with retries.
+
+        Args:
+            text: Text to get embeddings for
+
+        Returns:
+            Embedding values as a float32 array
+        """
+        context = await self._handle_api_call("embeddings", model=self.config.model, text=text)
+
+        # Use the Ollama API directly for embeddings since SK doesn't have a convenient method
+        async def _make_request() -> np.ndarray:
+            session = self._get_session()
+            async with self._embed_semaphore:
+                await self._wait_for_rate_limit()
+                return await post_embedding(session, self._embeddings_url, self.config.model, text, context)
+
+        return await self.retry_handler.retry(_make_request, context)
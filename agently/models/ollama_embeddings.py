@@ -0,0 +1,160 @@
+"""Request helpers for Ollama's embeddings endpoint.
+
+Kept separate from the provider so the per-request path is a plain
+module-level coroutine: it takes an open session and returns a float32
+array, classifying failures as transient or permanent for the retry handler.
+"""
+
+import asyncio
+import json
+import re
+import time
+from email.utils import parsedate_to_datetime
+from typing import Any, Optional
+
+import aiohttp
+import numpy as np
+
+from agently.errors import ErrorContext, PermanentModelError, RateLimitError, TransientModelError
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+_JSON_HEADERS = {"Content-Type": "application/json"}
+
+# Start of the vector in an embeddings response body, e.g. b'{"embedding":['
+_EMBEDDING_ARRAY_PATTERN = re.compile(rb'"embedding"\s*:\s*\[')
+
+
+def _json_dumps(obj: Any) -> bytes:
+    """Serialize a request body, using orjson when it is installed."""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj).encode()
+
+
+def _json_loads(data: bytes) -> Any:
+    """Parse a response body, using orjson when it is installed."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def parse_embedding(raw: bytes) -> np.ndarray:
+    """Parse the embedding out of a raw /api/embeddings response body.
+
+    The numeric array is sliced out of the body and handed straight to numpy,
+    so no intermediate dict is built. Bodies that don't match the expected
+    shape fall back to a full JSON parse.
+
+    Args:
+        raw: Response body bytes
+
+    Returns:
+        Embedding values as a float32 array
+
+    Raises:
+        ValueError: If the body is not valid JSON or holds no numeric embedding
+    """
+    match = _EMBEDDING_ARRAY_PATTERN.search(raw)
+    if match is not None:
+        end = raw.find(b"]", match.end())
+        if end != -1:
+            values = raw[match.end() : end]
+            if not values.strip():
+                return np.empty(0, dtype=np.float32)
+            try:
+                return np.array(values.split(b","), dtype=np.float32)
+            except ValueError:
+                pass
+
+    result = _json_loads(raw)
+    embedding = result.get("embedding") if isinstance(result, dict) else None
+    if not isinstance(embedding, list):
+        raise ValueError("Response body has no embedding")
+    try:
+        return np.asarray(embedding, dtype=np.float32)
+    except TypeError as e:
+        raise ValueError(f"Embedding is not a list of numbers: {e}") from e
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Parse a Retry-After header given either in seconds or as an HTTP date.
+
+    Args:
+        value: Raw header value
+
+    Returns:
+        Seconds to wait, or None if the header is missing or malformed
+    """
+    if not value:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        return max(parsedate_to_datetime(value).timestamp() - time.time(), 0.0)
+    except (TypeError, ValueError):
+        return None
+
+
+async def post_embedding(
+    session: aiohttp.ClientSession, url: str, model: str, text: str, context: ErrorContext
+) -> np.ndarray:
+    """Request the embedding for one text.
+
+    Args:
+        session: Open HTTP session to send the request on
+        url: Full URL of the embeddings endpoint
+        model: Name of the embedding model
+        text: Text to get embeddings for
+        context: Error context attached to any raised error
+
+    Returns:
+        Embedding values as a float32 array
+
+    Raises:
+        RateLimitError: If the server asks the client to back off
+        TransientModelError: For server errors, connection failures and timeouts
+        PermanentModelError: For client errors and unparseable responses
+    """
+    try:
+        async with session.post(url, data=_json_dumps({"model": model, "prompt": text}), headers=_JSON_HEADERS) as response:
+            if response.status != 200:
+                error_text = await response.text()
+                retry_after = parse_retry_after(response.headers.get("Retry-After"))
+                if response.status in (429, 503) and retry_after is not None:
+                    raise RateLimitError(
+                        message=f"Ollama API rate limited getting embeddings: {error_text}",
+                        context=context,
+                        retry_after=retry_after,
+                    )
+                # Server errors may clear up; bad requests and unknown models won't
+                error_type = TransientModelError if response.status == 429 or response.status >= 500 else PermanentModelError
+                raise error_type(
+                    message=f"Ollama API error getting embeddings: {error_text}",
+                    context=context,
+                    recovery_hint="Check Ollama server status and model availability",
+                )
+
+            raw = await response.read()
+    except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+        raise TransientModelError(
+            message=f"Ollama API error getting embeddings: {str(e)}",
+            context=context,
+            recovery_hint="Check that the Ollama server is running and reachable",
+            cause=e,
+        )
+
+    try:
+        return parse_embedding(raw)
+    except ValueError as e:
+        raise PermanentModelError(
+            message=f"Ollama API returned an invalid embeddings response: {str(e)}",
+            context=context,
+            recovery_hint="Check that the model supports embeddings",
+            cause=e,
+        )
@@ -9,6 +9,7 @@ This module provides integration with OpenAI's API, including:
 import os
 from typing import Any, AsyncIterator
 
+import numpy as np
 from semantic_kernel.connectors.ai.function_choice_behavior import (
     FunctionChoiceBehavior,
 )
@@ -127,14 +128,14 @@ class OpenAIProvider(ModelProvider):
             error = self._create_model_error(message=f"Unexpected error: {str(e)}", context=context, cause=e)
             yield f"Error: {str(error)} - {error.recovery_hint}"
 
-    async def get_embeddings(self, text: str) -> list[float]:
+    async def get_embeddings(self, text: str) -> np.ndarray:
         """Get embeddings for text using OpenAI's API.
 
         Args:
             text: Text to get embeddings for
 
         Returns:
-            List of embedding values
+            Embedding values as a float32 array
 
         Raises:
             ModelError: For API errors or unexpected issues
@@ -152,7 +153,7 @@ class OpenAIProvider(ModelProvider):
 
                     # Get embeddings
                     response = await openai_client.embeddings.create(model="text-embedding-ada-002", input=text)
-                    return response.data[0].embedding
+                    return np.asarray(response.data[0].embedding, dtype=np.float32)
                 except Exception as e:
                     raise ModelError(
                         message=f"OpenAI API error getting embeddings: {str(e)}",
@@ -1,22 +1,437 @@
 """Plugin source handling system."""
 
+import asyncio
+import hashlib
 import importlib.util
 import json
 import logging
+import os
 import re
+import shutil
 import subprocess
 import sys
+import threading
 from abc import ABC, abstractmethod
-from dataclasses import dataclass, field
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from functools import lru_cache, partial
 from pathlib import Path
-from typing import Any, Dict, Optional, Type, cast
+from stat import S_ISDIR, S_ISREG
+from types import ModuleType
+from typing import Any, Dict, FrozenSet, List, Optional, Tuple, Type, cast
 
 from typing_extensions import Protocol
 
 from .base import Plugin
 
+try:
+    from blake3 import blake3
+except ImportError:  # pragma: no cover - optional dependency
+    blake3 = None
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
 logger = logging.getLogger(__name__)
 
+# Local plugin hashes only detect changes, so prefer the much faster BLAKE3 when it's installed
+_PLUGIN_HASH_ALGORITHM = "b3" if blake3 is not None else "sha256"
+
+# Inputs above this size are hashed with BLAKE3's multithreaded mode
+_BLAKE3_THREADED_MIN_SIZE = 1 << 20
+
+# Plugin files are streamed through the hasher in chunks of this size
+_HASH_CHUNK_SIZE = 1 << 20
+
+# Plugin files to hash totalling less than this are read on one thread
+_SEQUENTIAL_HASH_MAX_BYTES = 8 << 20
+
+# Upper bound on threads used to hash the files of one plugin directory
+_MAX_HASH_WORKERS = 8
+
+# Upper bound on repositories cloned or updated at once by prepare_github_sources
+_MAX_CLONE_WORKERS = 16
+
+# Directories inside a plugin that never contain plugin code: caches, VCS data, environments and build output
+_SKIPPED_DIRS = frozenset(
+    {"__pycache__", ".git", ".venv", "venv", "node_modules", ".mypy_cache", ".pytest_cache", "build", "dist", ".tox"}
+)
+
+# File next to the plugin cache directories that keeps local plugin file digests between runs
+_SHA_CACHE_NAME = ".shacache.json"
+
+# Per-thread scratch buffer for streaming files into a hasher
+_hash_buffers = threading.local()
+
+# Parsed lockfiles by path, with the mtime_ns and size they were read at
+_LOCKFILE_CACHE: Dict[str, Tuple[int, int, Dict[str, Any]]] = {}
+
+# The latest plugin class loaded from local files, with the LocalPluginSource._scan_plugin signature it was
+# loaded at, keyed by module path, namespace and plugin name. Loading sets the namespace and name on the class,
+# so sources that name the same files differently each get their own class. Reloading changed files replaces
+# the entry, so the cache holds one class per source.
+_LOAD_CACHE: Dict[Tuple[str, str, str], Tuple[Tuple[Any, ...], Type[Plugin]]] = {}
+
+# Optional scheme and host in front of a GitHub "user/repo" path
+_REPO_URL_PREFIX_PATTERN = re.compile(r"^(?:https?://)?(?:github\.com/)?")
+
+# The "user/repo" part of a GitHub repository path, matched after the prefix
+_REPO_PATH_PATTERN = re.compile(r"(?P<namespace>[^/]+)/(?P<repo>[^/]+)")
+
+# A full SHA-1 or SHA-256 commit id
+_COMMIT_SHA_PATTERN = re.compile(r"[0-9a-f]{40}(?:[0-9a-f]{24})?")
+
+
+def _new_plugin_hasher(algorithm: str, size: int = 0) -> Any:
+    """Create a hasher for plugin content.
+
+    Args:
+        algorithm: "b3" for BLAKE3 or "sha256" for SHA-256
+        size: Expected input size in bytes, used to decide on multithreading
+
+    Returns:
+        A hashlib-style hasher
+    """
+    if algorithm == "b3":
+        if size >= _BLAKE3_THREADED_MIN_SIZE:
+            return blake3(max_threads=blake3.AUTO)
+        return blake3()
+    return hashlib.sha256()
+
+
+def _hash_buffer() -> memoryview:
+    """Get this thread's scratch buffer for streaming files.
+
+    Returns:
+        A writable view of _HASH_CHUNK_SIZE bytes
+    """
+    buffer = getattr(_hash_buffers, "view", None)
+    if buffer is None or len(buffer) != _HASH_CHUNK_SIZE:
+        buffer = _hash_buffers.view = memoryview(bytearray(_HASH_CHUNK_SIZE))
+    return buffer
+
+
+def _update_from_file(hasher: Any, path: Path) -> None:
+    """Feed a file into a hasher in fixed-size chunks.
+
+    Args:
+        hasher: Hasher to update
+        path: File to read
+    """
+    buffer = _hash_buffer()
+    with open(path, "rb", buffering=0) as f:
+        while n := f.readinto(buffer):
+            hasher.update(buffer[:n])
+
+
+def _scan_python_files(root: Path, skip_dirs: FrozenSet[str] = _SKIPPED_DIRS) -> List[Tuple[Path, int, int]]:
+    """Find the Python files under a directory with a single scandir walk.
+
+    Symlinked directories are not followed.
+
+    Args:
+        root: Directory to search
+        skip_dirs: Names of directories whose contents are ignored
+
+    Returns:
+        (path, mtime_ns, size) for each .py file, sorted by path
+    """
+    found = []
+    pending = [os.fspath(root)]
+    while pending:
+        with os.scandir(pending.pop()) as entries:
+            for entry in entries:
+                # Both checks use the file type reported by readdir, without a stat call
+                if entry.is_dir(follow_symlinks=False):
+                    if entry.name not in skip_dirs:
+                        pending.append(entry.path)
+                elif entry.name.endswith(".py") and entry.is_file():
+                    stat = entry.stat()
+                    found.append((Path(entry.path), stat.st_mtime_ns, stat.st_size))
+    found.sort()
+    return found
+
+
+def _json_loads(data: bytes) -> Any:
+    """Parse JSON, using orjson when it is installed."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _load_lockfile(path: Path) -> Dict[str, Any]:
+    """Read a lockfile, reusing the parsed contents while the file is unchanged.
+
+    The returned dict is shared between callers and must not be modified.
+
+    Args:
+        path: Path to the lockfile
+
+    Returns:
+        The parsed lockfile
+
+    Raises:
+        OSError: If the lockfile can't be read
+        json.JSONDecodeError: If the lockfile isn't valid JSON (orjson's error is a subclass)
+    """
+    stat = path.stat()
+    key = str(path)
+    cached = _LOCKFILE_CACHE.get(key)
+    if cached is not None and cached[:2] == (stat.st_mtime_ns, stat.st_size):
+        return cached[2]
+
+    lockfile = _json_loads(path.read_bytes())
+    _LOCKFILE_CACHE[key] = (stat.st_mtime_ns, stat.st_size, lockfile)
+    return lockfile
+
+
+def write_lockfile(path: Path, lockfile: Dict[str, Any]) -> None:
+    """Write a lockfile.
+
+    The contents are synced to a temporary file that then replaces the
+    lockfile, so an interrupted write never leaves a truncated lockfile. A
+    lockfile that already holds exactly these contents is left untouched.
+
+    Plugin sources read the lockfile back without parsing it again until it
+    changes on disk. They get their own copy of the contents, so the caller
+    may keep modifying the dict it passed in.
+
+    Args:
+        path: Path to the lockfile
+        lockfile: The lockfile contents
+
+    Raises:
+        OSError: If the lockfile can't be written
+    """
+    data = json.dumps(lockfile, indent=2).encode()
+    try:
+        unchanged = path.read_bytes() == data
+    except OSError:
+        unchanged = False
+
+    if not unchanged:
+        temp_path = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        try:
+            with open(temp_path, "wb") as f:
+                f.write(data)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temp_path, path)
+        except BaseException:
+            temp_path.unlink(missing_ok=True)
+            raise
+
+    stat = path.stat()
+    _LOCKFILE_CACHE[str(path)] = (stat.st_mtime_ns, stat.st_size, _json_loads(data))
+
+
+def _git_network_env() -> Dict[str, str]:
+    """Get the environment for git commands that talk to a remote.
+
+    Credential prompts are disabled, so a private or missing repository
+    fails at once instead of waiting for input that never comes.
+
+    Returns:
+        The current environment with terminal prompts turned off
+    """
+    return {**os.environ, "GIT_TERMINAL_PROMPT": "0"}
+
+
+def _read_head_sha(repo_path: Path) -> str:
+    """Read the checked out commit of a repository without running git.
+
+    Handles a detached HEAD and branches stored as loose or packed refs.
+    Anything else, such as a ``.git`` file pointing elsewhere, is left to git.
+
+    Args:
+        repo_path: Root of the repository
+
+    Returns:
+        The commit SHA, or empty string if it couldn't be determined
+    """
+    git_dir = repo_path / ".git"
+    try:
+        head = (git_dir / "HEAD").read_text().strip()
+        if not head.startswith("ref: "):
+            return head if _COMMIT_SHA_PATTERN.fullmatch(head) else ""
+
+        ref = head[5:]
+        ref_path = git_dir / ref
+        if ref_path.is_file():
+            sha = ref_path.read_text().strip()
+            return sha if _COMMIT_SHA_PATTERN.fullmatch(sha) else ""
+
+        with open(git_dir / "packed-refs", "r") as f:
+            for line in f:
+                sha, _, name = line.rstrip("\n").partition(" ")
+                if name == ref and _COMMIT_SHA_PATTERN.fullmatch(sha):
+                    return sha
+    except (OSError, UnicodeDecodeError):
+        pass
+    return ""
+
+
+def _plugin_module_name(name: str, module_path: Path) -> str:
+    """Get the name to import a plugin module under.
+
+    Plugins from different places may share a name, so the module name
+    includes a digest of the path.
+
+    Args:
+        name: Plugin or file name the module is named after
+        module_path: Path of the module file or package directory
+
+    Returns:
+        A module name unique to the path
+    """
+    path_digest = hashlib.sha256(os.path.abspath(module_path).encode()).hexdigest()[:8]
+    return f"{name}_{path_digest}"
+
+
+def _import_package(name: str, package_dir: Path) -> ModuleType:
+    """Import a package straight from its directory, without adding its parent to sys.path.
+
+    A module already imported under the name is returned as-is.
+
+    Args:
+        name: Name to import the package as
+        package_dir: Directory containing the package's __init__.py
+
+    Returns:
+        The package module
+
+    Raises:
+        ImportError: If no module spec can be created for the package
+    """
+    module = sys.modules.get(name)
+    if module is not None:
+        return module
+
+    spec = importlib.util.spec_from_file_location(
+        name, package_dir / "__init__.py", submodule_search_locations=[str(package_dir)]
+    )
+    if not spec or not spec.loader:
+        raise ImportError(f"Could not load plugin spec from: {package_dir}")
+
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    try:
+        spec.loader.exec_module(module)
+    except BaseException:
+        # Like a regular import, don't leave a half-initialized module behind
+        sys.modules.pop(name, None)
+        raise
+    return module
+
+
+def _find_plugin_class(module: ModuleType) -> Optional[type]:
+    """Find the plugin class defined in a module.
+
+    Classes are checked in definition order, straight from the module's
+    namespace. The first one defined in the module itself that has the
+    attributes of a Plugin is returned.
+
+    Args:
+        module: The imported plugin module
+
+    Returns:
+        The plugin class, or None if the module doesn't define one
+    """
+    module_name = module.__name__
+    for item in vars(module).values():
+        if isinstance(item, type) and item.__module__ == module_name and _has_plugin_attributes(item):
+            return item
+    return None
+
+
+def _has_plugin_attributes(item: type) -> bool:
+    """Check whether a class has the attributes of a Plugin, whatever it inherits from.
+
+    Args:
+        item: The class to check
+
+    Returns:
+        True if the class can be used as a plugin
+    """
+    return (
+        hasattr(item, "name")
+        and hasattr(item, "description")
+        and hasattr(item, "plugin_instructions")
+        # A missing get_kernel_functions reads as None, which isn't callable
+        and callable(getattr(item, "get_kernel_functions", None))
+    )
+
+
+def _hash_file(algorithm: str, path: Path) -> bytes:
+    """Hash a single file.
+
+    Args:
+        algorithm: "b3" for BLAKE3 or "sha256" for SHA-256
+        path: File to hash
+
+    Returns:
+        The raw digest of the file's contents
+    """
+    hasher = _new_plugin_hasher(algorithm, path.stat().st_size)
+    _update_from_file(hasher, path)
+    return hasher.digest()
+
+
+def _combine_digests(algorithm: str, digests: Dict[str, List[Any]]) -> str:
+    """Combine per-file digests into a plugin directory SHA.
+
+    Each relative path is length-prefixed, so no two different sets of files
+    can produce the same combined input.
+
+    Args:
+        algorithm: "b3" for BLAKE3 or "sha256" for SHA-256
+        digests: [size, mtime_ns, hex digest] by relative path, from _file_digests
+
+    Returns:
+        The combined digest prefixed with "<algorithm>:"
+    """
+    hasher = _new_plugin_hasher(algorithm)
+    for rel_path in sorted(digests):
+        encoded = rel_path.encode()
+        hasher.update(len(encoded).to_bytes(4, "little"))
+        hasher.update(encoded)
+        hasher.update(bytes.fromhex(digests[rel_path][2]))
+    return f"{algorithm}:{hasher.hexdigest()}"
+
+
+@lru_cache(maxsize=None)
+def _mcp_server_plugin(namespace: str, name: str) -> Type[Plugin]:
+    """Get the placeholder plugin class for an MCP server.
+
+    The class implements the Plugin interface until actual MCP server
+    integration is handled by the agent. It is built once per server.
+
+    Args:
+        namespace: Namespace of the MCP server
+        name: Name of the MCP server
+
+    Returns:
+        The placeholder plugin class
+    """
+
+    class MCPServerPlugin(Plugin):
+        """Placeholder for MCP server plugin."""
+
+        description = "MCP Server plugin"
+        plugin_instructions = "This plugin provides access to an MCP server."
+
+        @classmethod
+        def get_kernel_functions(cls):
+            """Return an empty dictionary since the actual functions are provided by the MCP server."""
+            return {}
+
+    # Class bodies can't read the enclosing arguments under the same names
+    MCPServerPlugin.name = name
+    MCPServerPlugin.namespace = namespace
+    return MCPServerPlugin
+
 
 # Define a Protocol for Plugin classes
 class PluginClass(Protocol):
@@ -26,12 +441,27 @@ class PluginClass(Protocol):
     name: str
 
 
-@dataclass
 class PluginSource(ABC):
     """Base class for plugin sources."""
 
-    name: str = field(default="")
-    force_reinstall: bool = field(default=False)
+    __slots__ = ("name", "force_reinstall", "_needs_update_cache")
+
+    def __init__(self, name: str = "", force_reinstall: bool = False):
+        """Initialize a plugin source.
+
+        Args:
+            name: Name of the plugin
+            force_reinstall: Whether to reinstall the plugin even if it is up to date
+        """
+        self.name = name
+        self.force_reinstall = force_reinstall
+
+        # Last needs_update comparison as (lockfile SHA, current SHA, decision)
+        self._needs_update_cache: Optional[Tuple[str, str, bool]] = None
+
+    def __repr__(self) -> str:
+        """Return a debug representation of the source."""
+        return f"{type(self).__name__}(name={self.name!r}, force_reinstall={self.force_reinstall!r})"
 
     @abstractmethod
     def load(self) -> Type[Plugin]:
@@ -69,6 +499,18 @@ class PluginSource(ABC):
             A SHA string representing the plugin's current state
         """
 
+    def _sha_matches(self, current_sha: str, lockfile_sha: str) -> bool:
+        """Check whether a lockfile SHA still describes this plugin.
+
+        Args:
+            current_sha: SHA of the plugin as it is now
+            lockfile_sha: SHA recorded in the lockfile
+
+        Returns:
+            True if the plugin is unchanged
+        """
+        return current_sha == lockfile_sha
+
     def needs_update(self, lockfile_sha: str) -> bool:
         """Check if the plugin needs to be updated based on lockfile SHA.
 
@@ -79,74 +521,39 @@ class PluginSource(ABC):
             True if plugin needs update, False otherwise
         """
         try:
-            logger.info(f"Checking if plugin {self.name} needs update (lockfile_sha: {lockfile_sha})")
-            logger.info(f"Plugin type: {getattr(self, 'plugin_type', 'unknown')}")
-            logger.info(f"Path: {getattr(self, 'path', 'unknown')}")
+            logger.debug("Checking if plugin %s needs update (lockfile_sha: %s)", self.name, lockfile_sha)
 
             # If force_reinstall is True, always update
             if self.force_reinstall:
-                logger.debug(f"Force reinstall enabled for {self.name}")
+                logger.debug("Force reinstall enabled for %s", self.name)
                 return True
 
-            # Get the plugin directory - use _get_cache_path instead of _get_plugin_dir
-            plugin_dir = self._get_cache_path()
-            logger.info(f"Plugin directory: {plugin_dir}, exists: {plugin_dir.exists()}")
-
-            # If plugin_dir doesn't exist, it needs to be installed
-            if not plugin_dir.exists():
-                logger.debug(f"Plugin directory does not exist: {plugin_dir}")
+            # If no lockfile SHA is provided, we need to update to generate one
+            if not lockfile_sha:
+                logger.debug("No lockfile SHA for %s, assuming update needed", self.name)
                 return True
 
-            # For Git repositories, check commit SHA
-            git_dir = plugin_dir / ".git"
-            logger.info(f"Git directory: {git_dir}, exists: {git_dir.exists()}")
-
-            if git_dir.exists():
-                current_sha = self._get_current_sha()
-                logger.info(f"Current SHA: {current_sha}")
-
-                if not current_sha:
-                    logger.warning(f"Could not get commit SHA for {self.name}")
-                    return True
-
-                if not lockfile_sha:
-                    logger.debug(f"No lockfile SHA for {self.name}, assuming update needed")
-                    return True
+            # An empty SHA means the plugin isn't installed or can't be read
+            current_sha = self._get_current_sha()
+            if not current_sha:
+                logger.debug("Could not get current SHA for %s", self.name)
+                return True
 
-                if current_sha != lockfile_sha:
-                    logger.debug(f"SHA mismatch for {self.name}: {current_sha} != {lockfile_sha}")
-                    return True
+            # Comparing against a legacy lockfile SHA rehashes the plugin, so remember the outcome
+            cached = self._needs_update_cache
+            if cached is not None and cached[:2] == (lockfile_sha, current_sha):
+                return cached[2]
 
-                logger.info(f"SHAs match, no update needed for {self.name}")
-                return False
-            else:
-                # For local plugins, check file hash if lockfile has a SHA
-                logger.info("Not a git repository, treating as local plugin")
-                if lockfile_sha:
-                    current_sha = self._calculate_plugin_sha()
-                    logger.info(f"Calculated SHA: {current_sha}")
-                    logger.info(f"Lockfile SHA: {lockfile_sha}")
-                    logger.info(f"SHA match? {current_sha == lockfile_sha}")
-
-                    if not current_sha:
-                        logger.debug(f"Failed to calculate SHA for {self.name}")
-                        return True
-                    if current_sha != lockfile_sha:
-                        logger.debug(f"Local SHA mismatch for {self.name}: {current_sha} != {lockfile_sha}")
-                        return True
-                    # If SHA matches, no update needed
-                    logger.info(f"Local plugin SHA matches, no update needed for {self.name}")
-                    return False
-                else:
-                    # If no lockfile SHA is provided, we need to update to generate one
-                    logger.debug(f"No lockfile SHA for local plugin {self.name}, updating to generate one")
-                    return True
+            changed = not self._sha_matches(current_sha, lockfile_sha)
+            self._needs_update_cache = (lockfile_sha, current_sha, changed)
+            if changed:
+                logger.debug("SHA mismatch for %s: %s != %s", self.name, current_sha, lockfile_sha)
+                return True
 
-            # Default fallback - no update needed if we get to this point
-            logger.info(f"No update criteria matched, assuming no update needed for {self.name}")
+            logger.debug("SHAs match, no update needed for %s", self.name)
             return False
         except Exception as e:
-            logger.warning(f"Error checking if plugin needs update: {e}")
+            logger.warning("Error checking if plugin needs update: %s", e)
             # If we can't determine, assume update is needed
             return True
 
@@ -154,6 +561,8 @@ class PluginSource(ABC):
 class LocalPluginSource(PluginSource):
     """A plugin source from the local filesystem."""
 
+    __slots__ = ("path", "namespace", "plugin_type", "cache_dir", "_sha_cache")
+
     def __init__(
         self,
         path: Path,
@@ -165,7 +574,8 @@ class LocalPluginSource(PluginSource):
     ):
         """Initialize a local plugin source."""
         super().__init__(name=name, force_reinstall=force_reinstall)
-        self.path = path
+        # Normalized once, so later calls can use the path as is
+        self.path = Path(path)
         self.namespace = namespace
         self.plugin_type = plugin_type
         self.cache_dir = cache_dir
@@ -174,6 +584,9 @@ class LocalPluginSource(PluginSource):
         if self.cache_dir is None:
             self.cache_dir = Path.cwd() / ".agently" / "plugins" / self.plugin_type
 
+        # Last calculated SHA, keyed by the algorithm and the path, mtime and size of every hashed file
+        self._sha_cache: Optional[Tuple[Tuple[Any, ...], str]] = None
+
     def _get_current_sha(self) -> str:
         """Get the current SHA for this plugin source.
 
@@ -205,122 +618,155 @@ class LocalPluginSource(PluginSource):
             ImportError: If the plugin cannot be imported
             ValueError: If the plugin is invalid
         """
-        path = Path(self.path)
-        logger.info(f"Loading plugin from local path: {path}")
+        path = self.path
+        logger.info("Loading plugin from local path: %s", path)
 
-        if not path.exists():
-            logger.error(f"Plugin path does not exist: {path}")
+        # One stat tells whether the path exists and what kind of file it is
+        try:
+            mode = path.stat().st_mode
+        except OSError:
+            logger.error("Plugin path does not exist: %s", path)
             raise ImportError(f"Plugin path does not exist: {path}")
+        is_file = S_ISREG(mode)
 
         # Determine the plugin name if not provided
         plugin_name = self.name
         if not plugin_name:
-            plugin_name = path.stem if path.is_file() else path.name
+            plugin_name = path.stem if is_file else path.name
 
         # Check if we need to reinstall by comparing SHAs
         should_reinstall = self.force_reinstall
+        if should_reinstall:
+            # Hash the plugin afresh for the lockfile rather than trusting file timestamps
+            self._sha_cache = None
 
-        # If not forcing reinstall, check if the SHA has changed
-        if not should_reinstall:
-            # Calculate the current SHA
-            current_sha = self._calculate_plugin_sha()
-
-            # Get the SHA from the lockfile if it exists
-            lockfile_path = Path.cwd() / "agently.lockfile.json"
-            if lockfile_path.exists():
-                try:
-                    with open(lockfile_path, "r") as f:
-                        lockfile = json.load(f)
+        # One stat walk of the plugin serves both the SHA check and the loaded class cache
+        scan = None
 
-                    # Get the plugin key
-                    plugin_key = f"{self.namespace}/{plugin_name}"
+        # If not forcing reinstall, check if the SHA recorded in the lockfile has changed
+        lockfile_path = Path.cwd() / "agently.lockfile.json"
+        if not should_reinstall and lockfile_path.exists():
+            try:
+                lockfile = _load_lockfile(lockfile_path)
 
-                    # Determine where to check based on plugin type
-                    target_section = "mcp" if self.plugin_type == "mcp" else "sk"
+                # Get the plugin key
+                plugin_key = f"{self.namespace}/{plugin_name}"
 
-                    # Check if the plugin exists in the lockfile and get its SHA
-                    if plugin_key in lockfile.get("plugins", {}).get(target_section, {}):
-                        lockfile_sha = lockfile["plugins"][target_section][plugin_key].get("sha", "")
+                # Determine where to check based on plugin type
+                target_section = "mcp" if self.plugin_type == "mcp" else "sk"
 
-                        # If the SHA has changed, we should reinstall
-                        if lockfile_sha and lockfile_sha != current_sha:
-                            logger.info(f"Plugin SHA has changed, reinstalling: {lockfile_sha} -> {current_sha}")
-                            should_reinstall = True
-                except Exception as e:
-                    logger.warning(f"Failed to check SHA from lockfile: {e}")
-                    # If we can't check the SHA, we'll continue with loading
+                # Only hash the plugin if there is a recorded SHA to compare against
+                lockfile_sha = lockfile.get("plugins", {}).get(target_section, {}).get(plugin_key, {}).get("sha", "")
+                if lockfile_sha:
+                    scan = self._scan_plugin()
+                    current_sha = self._sha_from_scan(scan)
+                    if not self._sha_matches(current_sha, lockfile_sha):
+                        logger.info("Plugin SHA has changed, reinstalling: %s -> %s", lockfile_sha, current_sha)
+                        should_reinstall = True
+            except Exception as e:
+                logger.warning("Failed to check SHA from lockfile: %s", e)
+                # If we can't check the SHA, we'll continue with loading
 
         if should_reinstall:
-            logger.info(f"Reinstalling local plugin (force={self.force_reinstall})")
+            logger.info("Reinstalling local plugin (force=%s)", self.force_reinstall)
             # For local plugins, reinstallation just means reloading the module
             # We don't need to do anything special here since we'll reload it anyway
 
-        if path.is_file() and path.suffix == ".py":
+        if is_file and path.suffix == ".py":
             module_path = path
             module_name = path.stem
-            logger.info(f"Loading plugin from Python file: {module_path}")
-        elif path.is_dir() and (path / "__init__.py").exists():
+            logger.debug("Loading plugin from Python file: %s", module_path)
+        elif S_ISDIR(mode) and (path / "__init__.py").exists():
             module_path = path / "__init__.py"
             module_name = path.name
-            logger.info(f"Loading plugin from directory with __init__.py: {module_path}")
+            logger.debug("Loading plugin from directory with __init__.py: %s", module_path)
         else:
-            logger.error(f"Plugin path must be a .py file or directory with __init__.py: {path}")
+            logger.error("Plugin path must be a .py file or directory with __init__.py: %s", path)
             raise ImportError(f"Plugin path must be a .py file or directory with __init__.py: {path}")
 
+        # Reuse the class loaded earlier in this process if no plugin file has changed since
+        if should_reinstall:
+            scan = None
+        elif scan is None:
+            scan = self._scan_plugin()
+        cache_key = (str(module_path), self.namespace, plugin_name)
+        cached = _LOAD_CACHE.get(cache_key)
+        if scan and cached is not None and cached[0] == scan[0]:
+            logger.info("Using already loaded plugin class: %s", cached[1].__name__)
+            return cached[1]
+
+        module_name = _plugin_module_name(module_name, module_path)
+
         # Import the module
-        logger.debug(f"Creating module spec from file: {module_path}")
+        logger.debug("Creating module spec from file: %s", module_path)
         spec = importlib.util.spec_from_file_location(module_name, module_path)
         if not spec or not spec.loader:
-            logger.error(f"Could not load plugin spec from: {module_path}")
+            logger.error("Could not load plugin spec from: %s", module_path)
             raise ImportError(f"Could not load plugin spec from: {module_path}")
 
-        logger.debug(f"Creating module from spec: {spec}")
+        logger.debug("Creating module from spec: %s", spec)
         module = importlib.util.module_from_spec(spec)
         sys.modules[module_name] = module
 
-        logger.debug(f"Executing module: {module_name}")
+        logger.debug("Executing module: %s", module_name)
         try:
             spec.loader.exec_module(module)
-            logger.info(f"Module executed successfully: {module_name}")
+            logger.debug("Module executed successfully: %s", module_name)
         except Exception as e:
-            logger.error(f"Error executing module {module_name}: {e}", exc_info=e)
+            # Don't leave a half-initialized module behind for the next import
+            sys.modules.pop(module_name, None)
+            logger.error("Error executing module %s: %s", module_name, e, exc_info=e)
             raise ImportError(f"Error executing module {module_name}: {e}") from e
 
-        # Find the plugin class
-        logger.debug(f"Searching for Plugin subclass in module: {module_name}")
+        # Find the plugin class among the module's own attributes
+        logger.debug("Searching for Plugin subclass in module: %s", module_name)
+        namespace = module.__dict__
+        module_plugin = namespace.get("Plugin")
         plugin_class = None
-        for item_name in dir(module):
-            item = getattr(module, item_name)
-            logger.debug(f"Checking item: {item_name}, type: {type(item)}")
-
-            # First try direct inheritance check
-            if (
-                isinstance(item, type)
-                and hasattr(module, "Plugin")
-                and issubclass(item, getattr(module, "Plugin"))
-                and item != getattr(module, "Plugin")
-            ):
-                plugin_class = item
-                logger.info(f"Found Plugin subclass via direct inheritance: {item_name}")
-                break
-
-            # If that fails, check for duck typing - does it have the required attributes of a Plugin?
-            elif (
-                isinstance(item, type)
-                and hasattr(item, "name")
-                and hasattr(item, "description")
-                and hasattr(item, "plugin_instructions")
-            ):
-                # Check if it has the get_kernel_functions method
-                if hasattr(item, "get_kernel_functions") and callable(getattr(item, "get_kernel_functions")):
+        if isinstance(module_plugin, type):
+            # Plugin's direct subclasses defined in this module are found without scanning it.
+            # The namespace check skips classes left from earlier loads of the same module.
+            subclasses: List[type] = module_plugin.__subclasses__()
+            for item in subclasses:
+                if item.__module__ == namespace.get("__name__") and namespace.get(item.__name__) is item:
+                    plugin_class = item
+                    logger.debug("Found Plugin subclass via __subclasses__: %s", item.__name__)
+                    break
+
+        # Only classes other than the Plugin base itself can be the plugin
+        classes = []
+        if plugin_class is None:
+            classes = [
+                (item_name, item)
+                for item_name, item in namespace.items()
+                if isinstance(item, type) and item is not module_plugin
+            ]
+
+        # Then try indirect or imported subclasses, a tuple membership test on each class's MRO
+        if plugin_class is None and isinstance(module_plugin, type):
+            for item_name, item in classes:
+                if module_plugin in item.__mro__:
                     plugin_class = item
-                    logger.info(f"Found Plugin-compatible class via duck typing: {item_name}")
+                    logger.debug("Found Plugin subclass via direct inheritance: %s", item_name)
+                    break
+
+        # If that fails, check for duck typing - does it have the required attributes of a Plugin?
+        if plugin_class is None:
+            for item_name, item in classes:
+                if _has_plugin_attributes(item):
+                    plugin_class = item
+                    logger.debug("Found Plugin-compatible class via duck typing: %s", item_name)
                     break
 
         if not plugin_class:
-            logger.error(f"No Plugin subclass found in module: {module_path}")
+            logger.error("No Plugin subclass found in module: %s", module_path)
             raise ValueError(f"No Plugin subclass found in module: {module_path}")
 
+        if scan:
+            _LOAD_CACHE[cache_key] = (scan[0], plugin_class)
+        else:
+            _LOAD_CACHE.pop(cache_key, None)
+
         # Set the namespace and name on the plugin class
         plugin_class_with_attrs = cast(PluginClass, plugin_class)
         plugin_class_with_attrs.namespace = self.namespace
@@ -328,7 +774,7 @@ class LocalPluginSource(PluginSource):
 
         # Note: We no longer update the lockfile here, as it's handled by the _initialize_plugins function
 
-        logger.info(f"Successfully loaded plugin class: {plugin_class.__name__} as {self.namespace}/{plugin_name}")
+        logger.info("Successfully loaded plugin class: %s as %s/%s", plugin_class.__name__, self.namespace, plugin_name)
         return plugin_class
 
     def _calculate_plugin_sha(self) -> str:
@@ -337,53 +783,258 @@ class LocalPluginSource(PluginSource):
         For directories, this creates a SHA based on file contents and structure.
         For single files, it uses the file's content.
 
+        The result is reused until a file is added, removed or modified.
+
         Returns:
             A SHA string representing the plugin's current state
         """
-        import hashlib
+        return self._sha_from_scan(self._scan_plugin())
+
+    def _sha_from_scan(self, scan: Optional[Tuple[Tuple[Any, ...], List[Tuple[Path, int, int]]]]) -> str:
+        """Calculate the plugin SHA from a _scan_plugin result, reusing the last one if nothing changed.
+
+        Args:
+            scan: Result of _scan_plugin
+
+        Returns:
+            A SHA string representing the plugin's current state
+        """
+        if scan is None:
+            # Let _hash_plugin report the problem
+            return self._hash_plugin(_PLUGIN_HASH_ALGORITHM)
+
+        signature, files = scan
+        signature = (_PLUGIN_HASH_ALGORITHM, signature)
+        if self._sha_cache is not None and self._sha_cache[0] == signature:
+            logger.debug("Using cached SHA for plugin at path: %s", self.path)
+            return self._sha_cache[1]
+
+        # A single file (no scanned files) is one read to hash, no more than the persisted cache costs
+        if not files:
+            sha = self._hash_plugin(_PLUGIN_HASH_ALGORITHM, files)
+            self._sha_cache = (signature, sha) if sha else None
+            return sha
+
+        # Only files added or changed since an earlier run need reading
+        known = {} if self.force_reinstall else self._read_persisted_digests()
+        try:
+            digests = self._file_digests(_PLUGIN_HASH_ALGORITHM, files, known)
+        except OSError as e:
+            logger.warning("Failed to calculate SHA for directory %s: %s", self.path, e)
+            self._sha_cache = None
+            return ""
+
+        sha = _combine_digests(_PLUGIN_HASH_ALGORITHM, digests)
+        if digests != known:
+            self._persist_digests(digests)
+
+        self._sha_cache = (signature, sha)
+        return sha
 
-        path = Path(self.path)
-        logger.debug(f"Calculating SHA for plugin at path: {path}")
+    def _sha_cache_path(self) -> Path:
+        """Get the path of the file that keeps plugin file digests between runs.
+
+        Returns:
+            Path to the SHA cache, next to the plugin cache directories
+        """
+        return self.cache_dir.parent / _SHA_CACHE_NAME
+
+    def _read_persisted_digests(self) -> Dict[str, List[Any]]:
+        """Read the file digests an earlier run stored for this plugin.
+
+        Returns:
+            [size, mtime_ns, hex digest] by relative path, or an empty dict if
+            nothing usable was stored for the current hash algorithm
+        """
+        try:
+            entry = _json_loads(self._sha_cache_path().read_bytes()).get(str(self.path), {})
+        except (OSError, ValueError, AttributeError):
+            return {}
+        if not isinstance(entry, dict) or entry.get("algorithm") != _PLUGIN_HASH_ALGORITHM:
+            return {}
+        files = entry.get("files")
+        if not isinstance(files, dict):
+            return {}
+        return {
+            rel_path: value
+            for rel_path, value in files.items()
+            if isinstance(value, list) and len(value) == 3 and isinstance(value[2], str)
+        }
+
+    def _persist_digests(self, digests: Dict[str, List[Any]]) -> None:
+        """Store this plugin's file digests for later runs.
+
+        Nothing is stored unless the directory holding the plugin caches
+        already exists. The file is replaced atomically.
+
+        Args:
+            digests: [size, mtime_ns, hex digest] by relative path, from _file_digests
+        """
+        cache_path = self._sha_cache_path()
+        if not cache_path.parent.is_dir():
+            return
+
+        try:
+            entries = _json_loads(cache_path.read_bytes())
+            if not isinstance(entries, dict):
+                entries = {}
+        except (OSError, ValueError):
+            entries = {}
+        entries[str(self.path)] = {"algorithm": _PLUGIN_HASH_ALGORITHM, "files": digests}
+
+        temp_path = cache_path.with_name(f"{cache_path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        try:
+            temp_path.write_text(json.dumps(entries, indent=2))
+            os.replace(temp_path, cache_path)
+        except OSError as e:
+            logger.debug("Failed to persist SHA for plugin at path %s: %s", self.path, e)
+            temp_path.unlink(missing_ok=True)
+
+    def _file_digests(
+        self,
+        algorithm: str,
+        files: List[Tuple[Path, int, int]],
+        known: Optional[Dict[str, List[Any]]] = None,
+    ) -> Dict[str, List[Any]]:
+        """Hash each plugin file, reusing digests of files whose size and mtime are unchanged.
+
+        Above _SEQUENTIAL_HASH_MAX_BYTES of source to read, files are hashed concurrently.
+
+        Args:
+            algorithm: "b3" for BLAKE3 or "sha256" for SHA-256
+            files: Result of _scan_python_files for the plugin directory
+            known: Earlier result of this method, for the same algorithm
+
+        Returns:
+            [size, mtime_ns, hex digest] by relative path
+
+        Raises:
+            OSError: If a file can't be read
+        """
+        known = known or {}
+        digests: Dict[str, List[Any]] = {}
+        stale = []
+        for py_file, mtime_ns, size in files:
+            rel_path = py_file.relative_to(self.path).as_posix()
+            previous = known.get(rel_path)
+            if previous is not None and previous[0] == size and previous[1] == mtime_ns:
+                digests[rel_path] = previous
+            else:
+                stale.append((rel_path, py_file, mtime_ns, size))
+
+        if stale:
+            logger.debug("Hashing %s of %s files in %s", len(stale), len(files), self.path)
+            paths = [py_file for _, py_file, _, _ in stale]
+            workers = min(_MAX_HASH_WORKERS, os.cpu_count() or 1, len(paths))
+            if sum(size for *_, size in stale) < _SEQUENTIAL_HASH_MAX_BYTES or workers < 2:
+                hashed = [_hash_file(algorithm, py_file) for py_file in paths]
+            else:
+                with ThreadPoolExecutor(max_workers=workers) as executor:
+                    hashed = list(executor.map(partial(_hash_file, algorithm), paths))
+            for (rel_path, _, mtime_ns, size), digest in zip(stale, hashed):
+                digests[rel_path] = [size, mtime_ns, digest.hex()]
+
+        return digests
+
+    def _scan_plugin(self) -> Optional[Tuple[Tuple[Any, ...], List[Tuple[Path, int, int]]]]:
+        """Stat the plugin path and the Python files it contains.
+
+        Returns:
+            A signature that changes whenever a plugin file is added, removed or
+            modified, and the _scan_python_files result for a directory; or None
+            if the path can't be read
+        """
+        path = self.path
+        try:
+            stat = path.stat()
+            files = _scan_python_files(path) if path.is_dir() else []
+        except OSError:
+            return None
+        return (stat.st_mtime_ns, stat.st_size, tuple(files)), files
+
+    def _sha_matches(self, current_sha: str, lockfile_sha: str) -> bool:
+        """Check whether a lockfile SHA still describes this plugin.
+
+        Lockfiles written before hashes were tagged with their algorithm hold
+        plain SHA-256 digests; those are compared against a SHA-256 computed
+        the original way so that upgrading doesn't force a reinstall.
+
+        Args:
+            current_sha: SHA from _calculate_plugin_sha
+            lockfile_sha: SHA recorded in the lockfile
+
+        Returns:
+            True if the plugin is unchanged
+        """
+        if current_sha == lockfile_sha:
+            return True
+        if ":" in current_sha and ":" not in lockfile_sha:
+            return self._legacy_plugin_sha() == lockfile_sha
+        return False
+
+    def _hash_plugin(self, algorithm: str, files: Optional[List[Tuple[Path, int, int]]] = None) -> str:
+        """Hash the plugin directory or file with the given algorithm.
+
+        A directory's hash combines each file's relative path and digest, in
+        sorted path order.
+
+        Args:
+            algorithm: "b3" for BLAKE3 or "sha256" for SHA-256
+            files: Result of _scan_python_files for a directory, if already known
+
+        Returns:
+            The digest prefixed with "<algorithm>:", or empty string on failure
+        """
+        path = self.path
+        logger.debug("Calculating SHA for plugin at path: %s", path)
 
         if not path.exists():
-            logger.warning(f"Path does not exist, cannot calculate SHA: {path}")
+            logger.warning("Path does not exist, cannot calculate SHA: %s", path)
             return ""
 
         if path.is_file():
             # For a single file, hash its contents
             try:
-                with open(path, "rb") as f:
-                    file_hash = hashlib.sha256(f.read()).hexdigest()
-                logger.debug(f"Calculated SHA for file {path}: {file_hash[:8]}...")
+                file_hash = f"{algorithm}:{_hash_file(algorithm, path).hex()}"
+                logger.debug("Calculated SHA for file %s: %s...", path, file_hash[:16])
                 return file_hash
             except Exception as e:
-                logger.warning(f"Failed to calculate SHA for file {path}: {e}")
+                logger.warning("Failed to calculate SHA for file %s: %s", path, e)
                 return ""
         else:
             # For a directory, create a composite hash of all Python files
             try:
-                hasher = hashlib.sha256()
-
-                # Get all Python files in the directory and subdirectories
-                python_files = sorted(path.glob("**/*.py"))
-                logger.debug(f"Found {len(python_files)} Python files in {path}")
+                if files is None:
+                    files = _scan_python_files(path)
+                logger.debug("Found %s Python files in %s", len(files), path)
 
-                for py_file in python_files:
-                    # Add the relative path to the hash
-                    rel_path = py_file.relative_to(path)
-                    hasher.update(str(rel_path).encode())
-
-                    # Add the file content to the hash
-                    with open(py_file, "rb") as f:
-                        hasher.update(f.read())
-
-                dir_hash = hasher.hexdigest()
-                logger.debug(f"Calculated SHA for directory {path}: {dir_hash[:8]}...")
+                dir_hash = _combine_digests(algorithm, self._file_digests(algorithm, files))
+                logger.debug("Calculated SHA for directory %s: %s...", path, dir_hash[:16])
                 return dir_hash
             except Exception as e:
-                logger.warning(f"Failed to calculate SHA for directory {path}: {e}")
+                logger.warning("Failed to calculate SHA for directory %s: %s", path, e)
                 return ""
 
+    def _legacy_plugin_sha(self) -> str:
+        """Calculate the untagged SHA-256 written by older versions.
+
+        Returns:
+            The hex digest, or empty string on failure
+        """
+        path = self.path
+        try:
+            hasher = hashlib.sha256()
+            if path.is_file():
+                _update_from_file(hasher, path)
+            else:
+                for py_file, _, _ in _scan_python_files(path, skip_dirs=frozenset()):
+                    hasher.update(str(py_file.relative_to(path)).encode())
+                    _update_from_file(hasher, py_file)
+            return hasher.hexdigest()
+        except OSError as e:
+            logger.warning("Failed to calculate legacy SHA for %s: %s", path, e)
+            return ""
+
     def _get_plugin_info(self, plugin_class: Type[Plugin]) -> Dict[str, Any]:
         """Get information about the plugin for the lockfile.
 
@@ -397,9 +1048,7 @@ class LocalPluginSource(PluginSource):
         plugin_sha = self._calculate_plugin_sha()
 
         # Get current timestamp in ISO format for consistency with GitHub plugins
-        from datetime import datetime
-
-        current_time = datetime.utcnow().isoformat()
+        current_time = datetime.now(timezone.utc).isoformat()
 
         plugin_class_with_attrs = cast(PluginClass, plugin_class)
         return {
@@ -423,6 +1072,27 @@ class GitHubPluginSource(PluginSource):
     # MCP prefix standard
     MCP_PREFIX = "agently-mcp-"
 
+    __slots__ = (
+        "repo_url",
+        "plugin_path",
+        "namespace",
+        "version",
+        "cache_dir",
+        "plugin_type",
+        "full_repo_name",
+        "_git_meta",
+        "_repo_sha_cache",
+        "_version_normalized",
+        "_version_is_sha",
+        "_prepared",
+        "_loaded_class",
+        # Only set for MCP servers, by the config parser
+        "command",
+        "args",
+        "description",
+        "server_path",
+    )
+
     def __init__(
         self,
         repo_url: str,
@@ -446,6 +1116,18 @@ class GitHubPluginSource(PluginSource):
         # Initialize full_repo_name to ensure it always exists
         self.full_repo_name = ""
 
+        # Work tree details from the last _get_repo_sha call
+        self._git_meta: Optional[Dict[str, Any]] = None
+
+        # Last SHA read from .git as (repository path, HEAD mtime_ns, SHA)
+        self._repo_sha_cache: Optional[Tuple[str, int, str]] = None
+
+        # Whether prepare_github_sources already cloned or updated the repository for the next load
+        self._prepared = False
+
+        # Plugin class returned by the last load, reused until the repository is prepared or reinstalled again
+        self._loaded_class: Optional[Type[Plugin]] = None
+
         # Set default cache directory based on plugin type
         if self.cache_dir is None:
             self.cache_dir = Path.cwd() / ".agently" / "plugins" / self.plugin_type
@@ -462,21 +1144,19 @@ class GitHubPluginSource(PluginSource):
             # 3. user/agently-plugin-name
             # 4. user/name (without prefix, will add prefix automatically)
 
-            # Remove https:// prefix if present
-            clean_url = re.sub(r"^https?://", "", self.repo_url)
-
-            # Remove github.com/ prefix if present
-            clean_url = re.sub(r"^github\.com/", "", clean_url)
+            # Skip any https:// and github.com/ prefixes, so "github.com" is never read as the user
+            prefix = _REPO_URL_PREFIX_PATTERN.match(self.repo_url)
+            start = prefix.end() if prefix else 0
 
             # Now we should have user/repo format
-            match = re.match(r"([^/]+)/([^/]+)", clean_url)
+            match = _REPO_PATH_PATTERN.match(self.repo_url, start)
             if match:
                 # Extract namespace (user/org)
                 if not self.namespace:
-                    self.namespace = match.group(1)
+                    self.namespace = match.group("namespace")
 
                 # Extract repo name
-                repo_name = match.group(2)
+                repo_name = match.group("repo")
 
                 # Store original repo name
                 original_repo_name = repo_name
@@ -519,11 +1199,30 @@ class GitHubPluginSource(PluginSource):
         # Normalize the version string to the format Git expects.
         self._version_normalized = True
 
+        # A version pinned to a full commit SHA can be fetched directly and can never drift
+        self._version_is_sha = bool(_COMMIT_SHA_PATTERN.fullmatch(self.version or ""))
+
     def _get_cache_path(self) -> Path:
         """Get the path where this plugin version should be cached."""
         # The actual clone location is just the plugin name under the cache directory
         return self.cache_dir / self.name
 
+    def needs_update(self, lockfile_sha: str) -> bool:
+        """Check if the plugin needs to be updated based on lockfile SHA.
+
+        A version pinned to a commit SHA only needs updating when that commit
+        isn't the one checked out; the lockfile isn't consulted.
+
+        Args:
+            lockfile_sha: SHA hash from lockfile
+
+        Returns:
+            True if plugin needs update, False otherwise
+        """
+        if self._version_is_sha and not self.force_reinstall:
+            return self._get_current_sha() != self.version
+        return super().needs_update(lockfile_sha)
+
     def _get_lockfile_path(self) -> Path:
         """Get the path to the lockfile for this plugin."""
         # Return the lockfile path at the same level as the .agently folder
@@ -535,15 +1234,8 @@ class GitHubPluginSource(PluginSource):
         Returns:
             SHA from the git repository, or empty string if unavailable
         """
-        # Determine the plugin directory name
-        plugin_dir = self.cache_dir / self.name
-
-        # If directory doesn't exist, we can't get a SHA
-        if not plugin_dir.exists():
-            return ""
-
-        # Get SHA from the repository
-        return self._get_repo_sha(plugin_dir)
+        # A missing or non-repository plugin directory yields an empty SHA
+        return self._get_repo_sha(self._get_cache_path())
 
     def _get_plugin_info(self, plugin_class: Type[Plugin]) -> Dict[str, Any]:
         """Get information about the plugin for the lockfile.
@@ -561,9 +1253,7 @@ class GitHubPluginSource(PluginSource):
         commit_sha = self._get_repo_sha(plugin_dir)
 
         # Get current timestamp in ISO format
-        from datetime import datetime
-
-        current_time = datetime.utcnow().isoformat()
+        current_time = datetime.now(timezone.utc).isoformat()
 
         return {
             "namespace": plugin_class.namespace,
@@ -581,20 +1271,68 @@ class GitHubPluginSource(PluginSource):
     def _get_repo_sha(self, repo_path: Path) -> str:
         """Get the current commit SHA of the repository.
 
+        The commit is read straight from ``.git`` when possible, and reused
+        while ``.git/HEAD`` keeps its mtime until the next clone or update
+        through this source. Otherwise one
+        git invocation answers whether the path is a work tree, where its top
+        level is and which commit is checked out. The answer is kept in
+        ``self._git_meta``. A path inside some other repository (such as the
+        project itself) is not treated as the plugin's repository.
+
         Args:
             repo_path: Path to the repository
 
         Returns:
-            The commit SHA as a string
+            The commit SHA as a string, or empty string if repo_path is not a repository root
         """
         try:
-            # Run git command to get the current commit SHA
-            result = subprocess.run(["git", "rev-parse", "HEAD"], cwd=repo_path, capture_output=True, text=True, check=True)
-            return result.stdout.strip()
-        except subprocess.CalledProcessError as e:
-            logger.warning(f"Failed to get commit SHA: {e}")
+            head_mtime: Optional[int] = (Path(repo_path) / ".git" / "HEAD").stat().st_mtime_ns
+        except OSError:
+            head_mtime = None
+
+        cached = self._repo_sha_cache
+        if head_mtime is not None and cached is not None and cached[:2] == (str(repo_path), head_mtime):
+            sha = cached[2]
+        else:
+            sha = _read_head_sha(repo_path)
+            self._repo_sha_cache = (str(repo_path), head_mtime, sha) if sha and head_mtime is not None else None
+
+        if sha:
+            self._git_meta = {"sha": sha, "inside_work_tree": True, "toplevel": Path(repo_path)}
+            return sha
+
+        self._git_meta = None
+
+        # Without HEAD there's no repository unless .git points elsewhere; a missing
+        # plugin directory (not installed yet) is settled by one stat, without git
+        if not os.path.isdir(repo_path):
+            logger.debug("Plugin directory does not exist: %s", repo_path)
             return ""
 
+        try:
+            result = subprocess.run(
+                ["git", "-C", str(repo_path), "rev-parse", "HEAD", "--is-inside-work-tree", "--show-toplevel"],
+                capture_output=True,
+                check=True,
+            )
+        except (OSError, subprocess.CalledProcessError) as e:
+            logger.debug("Failed to get commit SHA for %s: %s", repo_path, e)
+            return ""
+
+        # The output is a few short lines; decode them directly rather than through a text wrapper
+        lines = result.stdout.splitlines()
+        if len(lines) < 3:
+            logger.warning("Unexpected git rev-parse output for %s: %r", repo_path, result.stdout)
+            return ""
+
+        sha, inside_work_tree = lines[0].decode("ascii", "replace"), lines[1].decode("ascii", "replace")
+        toplevel = os.fsdecode(lines[2])
+        self._git_meta = {"sha": sha, "inside_work_tree": inside_work_tree == "true", "toplevel": Path(toplevel)}
+        if not self._git_meta["inside_work_tree"] or Path(toplevel).resolve() != Path(repo_path).resolve():
+            logger.debug("%s is not the root of a git work tree", repo_path)
+            return ""
+        return sha
+
     def load(self) -> Type[Plugin]:
         """Load a plugin from a GitHub repository.
 
@@ -611,6 +1349,11 @@ class GitHubPluginSource(PluginSource):
             ImportError: If the plugin cannot be imported
             ValueError: If the plugin is invalid
         """
+        # A source loaded before in this process doesn't need git or an import again
+        if self._loaded_class is not None and not (self.force_reinstall or self._prepared):
+            logger.debug("Using already loaded plugin class for %s", self.name)
+            return self._loaded_class
+
         # Ensure the cache directory exists
         self.cache_dir.mkdir(parents=True, exist_ok=True)
 
@@ -620,31 +1363,17 @@ class GitHubPluginSource(PluginSource):
         # Full path to the plugin directory
         plugin_dir = self.cache_dir / plugin_dir_name
 
-        # Clone or update the repository
-        self._clone_or_update_repo(plugin_dir)
+        # Clone or update the repository, unless prepare_github_sources just did
+        if self._prepared:
+            self._prepared = False
+        else:
+            self._clone_or_update_repo(plugin_dir)
 
         # For MCP servers, we don't need to load a plugin class
         # We just return a special dummy class that satisfies the Plugin interface
         if self.plugin_type == "mcp":
-            # Create a dynamic class that implements the Plugin interface
-            # for MCP servers. This serves as a placeholder until actual
-            # MCP server integration is handled by the agent.
-            from agently.plugins.base import Plugin
-
-            class MCPServerPlugin(Plugin):
-                """Placeholder for MCP server plugin."""
-
-                name = self.name
-                description = "MCP Server plugin"
-                namespace = self.namespace
-                plugin_instructions = "This plugin provides access to an MCP server."
-
-                @classmethod
-                def get_kernel_functions(cls):
-                    """Return an empty dictionary since the actual functions are provided by the MCP server."""
-                    return {}
-
-            return MCPServerPlugin
+            self._loaded_class = _mcp_server_plugin(self.namespace, self.name)
+            return self._loaded_class
 
         # Determine plugin module path within the repository
         if self.plugin_path:
@@ -654,48 +1383,36 @@ class GitHubPluginSource(PluginSource):
             # Default: look for plugin code at the repository root
             module_path = plugin_dir
 
-        # Check if the module path exists
-        if not module_path.exists():
+        # Check if the module path exists, and what kind of file it is
+        try:
+            mode = module_path.stat().st_mode
+        except OSError:
             raise ImportError(f"Plugin path does not exist: {module_path}")
 
         # Import the plugin module
-        if module_path.is_file() and module_path.suffix == ".py":
+        if S_ISREG(mode) and module_path.suffix == ".py":
             # Single file plugin
-            spec = importlib.util.spec_from_file_location(self.name, module_path)
+            module_name = _plugin_module_name(self.name, module_path)
+            spec = importlib.util.spec_from_file_location(module_name, module_path)
             if not spec or not spec.loader:
                 raise ImportError(f"Could not load plugin spec from: {module_path}")
 
             module = importlib.util.module_from_spec(spec)
-            sys.modules[self.name] = module
-            spec.loader.exec_module(module)
-        elif module_path.is_dir() and (module_path / "__init__.py").exists():
-            # Package plugin
-            sys.path.insert(0, str(module_path.parent))
+            sys.modules[module_name] = module
             try:
-                module = importlib.import_module(module_path.name)
-            finally:
-                sys.path.pop(0)
+                spec.loader.exec_module(module)
+            except BaseException:
+                # Don't leave a half-initialized module behind for the next import
+                sys.modules.pop(module_name, None)
+                raise
+        elif S_ISDIR(mode) and (module_path / "__init__.py").exists():
+            # Package plugin
+            module = _import_package(_plugin_module_name(module_path.name, module_path), module_path)
         else:
             raise ImportError(f"Plugin path must be a .py file or directory with __init__.py: {module_path}")
 
         # Find the plugin class
-        plugin_class = None
-        for item_name in dir(module):
-            item = getattr(module, item_name)
-
-            # Check if it's a Plugin subclass
-            if (
-                isinstance(item, type)
-                and item.__module__ == module.__name__
-                and hasattr(item, "name")
-                and hasattr(item, "description")
-                and hasattr(item, "plugin_instructions")
-                and hasattr(item, "get_kernel_functions")
-                and callable(getattr(item, "get_kernel_functions"))
-            ):
-                plugin_class = item
-                break
-
+        plugin_class = _find_plugin_class(module)
         if not plugin_class:
             raise ValueError(f"No Plugin class found in module: {module_path}")
 
@@ -706,58 +1423,101 @@ class GitHubPluginSource(PluginSource):
 
         # Note: We no longer update the lockfile here, as it's handled by the _initialize_plugins function
 
+        self._loaded_class = plugin_class
         return plugin_class
 
     def _clone_or_update_repo(self, cache_path: Path) -> None:
         """Clone or update the repository to the cache directory."""
+        # The checked out commit is about to change
+        self._repo_sha_cache = None
+
         try:
-            # If force_reinstall is True, remove the directory if it exists
-            if self.force_reinstall and cache_path.exists():
-                import shutil
+            # Check once whether the directory exists and is a git repository
+            is_repo = os.path.exists(cache_path / ".git")
+            exists = is_repo or os.path.exists(cache_path)
 
-                logger.info(f"Force reinstall enabled, removing existing directory: {cache_path}")
+            # If force_reinstall is True, reset the repository in place, or remove the directory if that fails
+            if self.force_reinstall and exists:
+                if is_repo and self._force_update_repo(cache_path):
+                    return
+
+                logger.info("Force reinstall enabled, removing existing directory: %s", cache_path)
                 shutil.rmtree(cache_path)
+                exists = is_repo = False
+
+            if exists:
+                if is_repo:
+                    if self._version_is_sha:
+                        self._checkout_pinned_sha(cache_path)
+                        return
 
-            # Check if the directory exists and is a git repository
-            if cache_path.exists():
-                if (cache_path / ".git").exists():
                     # It's a git repository, update it
-                    logger.info(f"Repository already exists, updating from remote: {cache_path}")
+                    logger.info("Repository already exists, updating from remote: %s", cache_path)
+
+                    # A shallow clone only needs the version's latest commit, not every branch tip
+                    if (cache_path / ".git" / "shallow").exists() and self._shallow_fetch(cache_path):
+                        return
+
                     # Fetch the latest changes
-                    subprocess.run(["git", "fetch", "origin"], cwd=cache_path, check=True, capture_output=True)
+                    subprocess.run(
+                        ["git", "fetch", "-q", "origin"],
+                        env=_git_network_env(),
+                        cwd=cache_path,
+                        check=True,
+                        stdout=subprocess.DEVNULL,
+                        stderr=subprocess.PIPE,
+                    )
 
                     # Check out the specified version/branch/tag
                     self._checkout_version(cache_path)
                     return
-                elif self.force_reinstall:
-                    # Directory exists but is not a git repository and force_reinstall is True
-                    # It was already removed above
-                    pass
                 else:
                     # Directory exists but is not a git repository, remove it and clone
-                    import shutil
-
-                    logger.debug(f"Directory exists but is not a git repository, removing: {cache_path}")
+                    logger.debug("Directory exists but is not a git repository, removing: %s", cache_path)
                     shutil.rmtree(cache_path)
 
             # Ensure parent directory exists
             cache_path.parent.mkdir(parents=True, exist_ok=True)
 
             # Clone the repository
-            logger.debug(f"Cloning repository: {self.repo_url}")
+            logger.debug("Cloning repository: %s", self.repo_url)
             git_url = f"https://{self.repo_url}"
 
-            # First clone the repository
+            if self._version_is_sha:
+                # Fetch only the pinned commit rather than cloning every branch
+                cache_path.mkdir()
+                subprocess.run(
+                    ["git", "init", "-q"], cwd=cache_path, check=True, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE
+                )
+                subprocess.run(
+                    ["git", "remote", "add", "origin", git_url],
+                    cwd=cache_path,
+                    check=True,
+                    stdout=subprocess.DEVNULL,
+                    stderr=subprocess.PIPE,
+                )
+                self._checkout_pinned_sha(cache_path)
+                logger.info("Repository fetched at %s to %s", self.version, cache_path)
+                return
+
+            # Branches and tags only need their latest commit
+            if self._shallow_clone(git_url, cache_path):
+                logger.info("Repository cloned successfully to %s", cache_path)
+                return
+
+            # Anything else, such as an abbreviated commit SHA, needs the full history
             subprocess.run(
-                ["git", "clone", git_url, str(cache_path)],
+                ["git", "clone", "-q", git_url, str(cache_path)],
+                env=_git_network_env(),
                 check=True,
-                capture_output=True,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.PIPE,
             )
 
             # Check out the specified version/branch/tag
             self._checkout_version(cache_path)
 
-            logger.info(f"Repository cloned successfully to {cache_path}")
+            logger.info("Repository cloned successfully to %s", cache_path)
 
         except subprocess.CalledProcessError as e:
             error_msg = (
@@ -766,81 +1526,259 @@ class GitHubPluginSource(PluginSource):
             logger.error(error_msg)
             raise RuntimeError(f"Failed to clone repository {self.repo_url} at {self.version}: {error_msg}")
         except Exception as e:
-            logger.error(f"Error during repository clone or update: {e}")
+            logger.error("Error during repository clone or update: %s", e)
             raise RuntimeError(f"Failed to clone repository {self.repo_url} at {self.version}: {e}")
 
-    def _checkout_version(self, repo_path: Path) -> None:
-        """Check out the specified version (branch, tag, or commit)."""
+    def _force_update_repo(self, repo_path: Path) -> bool:
+        """Bring an existing clone to the remote version, discarding all local changes.
+
+        This ends in the same state as a fresh clone but reuses the objects
+        already downloaded.
+
+        Args:
+            repo_path: Path to the repository
+
+        Returns:
+            True if the repository was updated, False if it is unusable and must be cloned again
+        """
+        check = subprocess.run(
+            ["git", "rev-parse", "--is-inside-work-tree"], cwd=repo_path, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE
+        )
+        if check.returncode != 0:
+            logger.warning("Cached repository is unusable, cloning again: %s", repo_path)
+            return False
+
+        logger.info("Force reinstall enabled, resetting existing repository: %s", repo_path)
         try:
-            # Try to check out the version as-is
-            result = subprocess.run(
-                ["git", "checkout", self.version],
+            subprocess.run(
+                ["git", "reset", "-q", "--hard"],
                 cwd=repo_path,
-                capture_output=True,
-                text=True,
+                check=True,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.PIPE,
+            )
+            subprocess.run(
+                ["git", "clean", "-q", "-fdx"], cwd=repo_path, check=True, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE
             )
 
-            # If the checkout failed and the version doesn't start with 'v',
-            # try adding 'v' prefix (common for version tags)
-            if result.returncode != 0 and not self.version.startswith("v"):
-                versioned_tag = f"v{self.version}"
-                logger.info(f"Failed to checkout {self.version}, trying {versioned_tag}")
-                result = subprocess.run(
-                    ["git", "checkout", versioned_tag],
-                    cwd=repo_path,
-                    capture_output=True,
-                    text=True,
-                )
+            if self._version_is_sha:
+                self._checkout_pinned_sha(repo_path)
+                return True
+
+            # A shallow clone stays shallow: fetch just the version's latest commit
+            if (repo_path / ".git" / "shallow").exists() and self._shallow_fetch(repo_path):
+                return True
+
+            subprocess.run(
+                ["git", "fetch", "-q", "--force", "--tags", "--prune", "origin"],
+                env=_git_network_env(),
+                cwd=repo_path,
+                check=True,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.PIPE,
+            )
+        except subprocess.CalledProcessError as e:
+            logger.warning("Failed to reset cached repository, cloning again: %s", e)
+            return False
+
+        # A branch resolves to its just-fetched origin/ ref first, so this lands on the remote state
+        self._checkout_version(repo_path)
+        return True
+
+    def _shallow_fetch(self, repo_path: Path) -> bool:
+        """Fetch only the latest commit of the version into a clone and check it out.
+
+        Like _shallow_clone, a version without a 'v' prefix is also tried with one.
+
+        Args:
+            repo_path: Path to the repository
+
+        Returns:
+            True if the version was fetched and checked out, False if it isn't a branch or tag
+        """
+        refs = [self.version]
+        if not self.version.startswith("v"):
+            refs.append(f"v{self.version}")
+
+        for ref in refs:
+            fetch = subprocess.run(
+                ["git", "fetch", "-q", "--force", "--depth", "1", "origin", ref],
+                env=_git_network_env(),
+                cwd=repo_path,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.PIPE,
+            )
+            if fetch.returncode != 0:
+                continue
+            checkout = subprocess.run(
+                ["git", "-c", "advice.detachedHead=false", "checkout", "-q", "--force", "--detach", "FETCH_HEAD"],
+                cwd=repo_path,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.PIPE,
+            )
+            if checkout.returncode == 0:
+                logger.debug("Fetched %s at depth 1 into %s", ref, repo_path)
+                return True
+        return False
+
+    def _shallow_clone(self, git_url: str, cache_path: Path) -> bool:
+        """Clone only the latest commit of the version, treated as a branch or tag.
+
+        Like _checkout_version, a version without a 'v' prefix is also tried
+        with one, as is common for version tags.
+
+        Args:
+            git_url: URL of the repository
+            cache_path: Directory to clone into
+
+        Returns:
+            True if the version was cloned, False if it isn't a branch or tag
+        """
+        refs = [self.version]
+        if not self.version.startswith("v"):
+            refs.append(f"v{self.version}")
+
+        for ref in refs:
+            result = subprocess.run(
+                ["git", "clone", "-q", "--depth", "1", "--single-branch", "--branch", ref, git_url, str(cache_path)],
+                env=_git_network_env(),
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.PIPE,
+            )
+            if result.returncode == 0:
+                return True
+            # Only decode git's error output if it will be logged
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Shallow clone of %s failed: %s", ref, result.stderr.decode("utf-8", "replace").strip())
+        return False
+
+    def _checkout_pinned_sha(self, repo_path: Path) -> None:
+        """Check out the commit SHA given as the version, fetching only that commit.
+
+        Nothing is fetched when the commit is already checked out.
+
+        Args:
+            repo_path: Path to the repository
 
-            # If both checkout attempts failed, try to pull the latest changes
-            if result.returncode != 0:
-                logger.warning(f"Failed to checkout {self.version}, pulling latest changes")
+        Raises:
+            subprocess.CalledProcessError: If the commit can't be fetched or checked out
+        """
+        if _read_head_sha(repo_path) == self.version:
+            logger.info("Repository already at pinned commit %s: %s", self.version, repo_path)
+            return
+
+        subprocess.run(
+            ["git", "fetch", "-q", "--depth", "1", "origin", self.version],
+            env=_git_network_env(),
+            cwd=repo_path,
+            check=True,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.PIPE,
+        )
+        subprocess.run(
+            ["git", "checkout", "-q", "FETCH_HEAD"],
+            cwd=repo_path,
+            check=True,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.PIPE,
+        )
+        logger.info("Successfully checked out %s", self.version)
+
+    def _checkout_version(self, repo_path: Path) -> None:
+        """Check out the specified version (branch, tag, or commit).
+
+        The version is resolved locally in a single git process, preferring
+        the fetched remote branch, then the version as-is, then with a 'v'
+        prefix (common for version tags), and checked out as a detached HEAD.
+        Only a version that doesn't resolve is fetched from the remote.
+        """
+        try:
+            sha = self._resolve_version(repo_path)
+            if not sha:
+                logger.warning("Could not resolve %s locally, fetching it from the remote", self.version)
                 subprocess.run(
-                    ["git", "pull", "origin", self.version],
+                    ["git", "fetch", "-q", "origin", self.version],
+                    env=_git_network_env(),
                     cwd=repo_path,
                     check=True,
-                    capture_output=True,
+                    stdout=subprocess.DEVNULL,
+                    stderr=subprocess.PIPE,
                 )
+                sha = "FETCH_HEAD"
 
-            # Log success if it worked
-            if result.returncode == 0:
-                logger.info(f"Successfully checked out {self.version}")
+            subprocess.run(
+                ["git", "-c", "advice.detachedHead=false", "checkout", "-q", "--detach", sha],
+                cwd=repo_path,
+                check=True,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.PIPE,
+            )
+            logger.info("Successfully checked out %s", self.version)
 
         except subprocess.CalledProcessError as e:
-            logger.error(f"Failed to checkout version: {e}")
+            logger.error("Failed to checkout version: %s", e)
             raise RuntimeError(f"Failed to checkout version {self.version}: {e}")
         except Exception as e:
-            logger.error(f"Error during version checkout: {e}")
+            logger.error("Error during version checkout: %s", e)
             raise RuntimeError(f"Failed to checkout version {self.version}: {e}")
 
+    def _resolve_version(self, repo_path: Path) -> str:
+        """Resolve the version to a commit in the local repository.
+
+        Args:
+            repo_path: Path to the repository
+
+        Returns:
+            The commit SHA, or empty string if the version isn't known locally
+        """
+        candidates = [f"origin/{self.version}", self.version]
+        if not self.version.startswith("v"):
+            candidates.append(f"v{self.version}")
+
+        # cat-file answers every candidate in one process, one line each
+        result = subprocess.run(
+            ["git", "cat-file", "--batch-check"],
+            cwd=repo_path,
+            input="".join(f"{candidate}^{{commit}}\n" for candidate in candidates),
+            capture_output=True,
+            text=True,
+        )
+        if result.returncode != 0:
+            return ""
+
+        for line in result.stdout.splitlines():
+            sha, _, object_type = line.partition(" ")
+            if object_type.startswith("commit ") and _COMMIT_SHA_PATTERN.fullmatch(sha):
+                return sha
+        return ""
+
     def remove_from_lockfile(self) -> None:
         """Remove this plugin from the lockfile."""
         lockfile_path = self._get_lockfile_path()
 
         if not lockfile_path.exists():
-            logger.debug(f"No lockfile found at {lockfile_path}, nothing to remove")
+            logger.debug("No lockfile found at %s, nothing to remove", lockfile_path)
             return
 
         try:
-            with open(lockfile_path, "r") as f:
-                lockfile = json.load(f)
+            lockfile = _load_lockfile(lockfile_path)
         except json.JSONDecodeError:
-            logger.warning(f"Invalid lockfile at {lockfile_path}, cannot remove plugin")
+            logger.warning("Invalid lockfile at %s, cannot remove plugin", lockfile_path)
             return
 
         # Use consistent key format
         plugin_key = f"{self.namespace}/{self.name}"
 
-        # Remove the plugin entry if it exists
+        # Remove the plugin entry if it exists, without modifying the shared parsed lockfile
         if plugin_key in lockfile.get("plugins", {}):
-            logger.info(f"Removing plugin {plugin_key} from lockfile")
-            lockfile["plugins"].pop(plugin_key)
+            logger.info("Removing plugin %s from lockfile", plugin_key)
+            plugins = {key: value for key, value in lockfile["plugins"].items() if key != plugin_key}
+            lockfile = {**lockfile, "plugins": plugins}
 
-            # Write updated lockfile
-            with open(lockfile_path, "w") as f:
-                json.dump(lockfile, f, indent=2)
+            # Write updated lockfile, which the next read reuses without parsing it again
+            write_lockfile(lockfile_path, lockfile)
         else:
-            logger.debug(f"Plugin {plugin_key} not found in lockfile")
+            logger.debug("Plugin %s not found in lockfile", plugin_key)
 
     def _calculate_plugin_sha(self) -> str:
         """Calculate a SHA for the plugin directory or file.
@@ -851,3 +1789,76 @@ class GitHubPluginSource(PluginSource):
             A SHA string representing the plugin's current state
         """
         return self._get_current_sha()
+
+
+def prepare_github_sources(sources: List[GitHubPluginSource]) -> List[Optional[Exception]]:
+    """Clone or update the repositories of several GitHub plugin sources concurrently.
+
+    Sources sharing a cache path are prepared one after another. The next
+    load() of each successfully prepared source skips the clone or update.
+
+    Args:
+        sources: Plugin sources to prepare
+
+    Returns:
+        The error raised for each source, or None where it succeeded
+    """
+    errors: List[Optional[Exception]] = [None] * len(sources)
+    groups: Dict[Path, List[int]] = {}
+    for index, source in enumerate(sources):
+        groups.setdefault(source._get_cache_path(), []).append(index)
+
+    def prepare(indexes: List[int]) -> None:
+        for index in indexes:
+            source = sources[index]
+            try:
+                source.cache_dir.mkdir(parents=True, exist_ok=True)
+                source._clone_or_update_repo(source._get_cache_path())
+                source._prepared = True
+            except Exception as e:
+                errors[index] = e
+
+    if groups:
+        with ThreadPoolExecutor(max_workers=min(_MAX_CLONE_WORKERS, len(groups))) as executor:
+            list(executor.map(prepare, groups.values()))
+    return errors
+
+
+async def load_many(sources: List[PluginSource]) -> List[Type[Plugin]]:
+    """Load several plugin sources concurrently.
+
+    GitHub repositories are cloned or updated together first, then each
+    source is loaded in a worker thread. Sources sharing a cache path are
+    loaded one after another.
+
+    Args:
+        sources: Plugin sources to load
+
+    Returns:
+        The plugin class of each source, in the order given
+
+    Raises:
+        Exception: The first error raised while preparing or loading a source
+    """
+    github_indexes = [index for index, source in enumerate(sources) if isinstance(source, GitHubPluginSource)]
+    github_sources: List[GitHubPluginSource] = [source for source in sources if isinstance(source, GitHubPluginSource)]
+    prepare_errors: Dict[int, Optional[Exception]] = {}
+    if github_sources:
+        errors = await asyncio.to_thread(prepare_github_sources, github_sources)
+        prepare_errors = dict(zip(github_indexes, errors))
+
+    groups: Dict[Path, List[int]] = {}
+    for index, source in enumerate(sources):
+        groups.setdefault(source._get_cache_path(), []).append(index)
+
+    results: List[Any] = [None] * len(sources)
+
+    def load_group(indexes: List[int]) -> None:
+        for index in indexes:
+            error = prepare_errors.get(index)
+            if error is not None:
+                raise error
+            results[index] = sources[index].load()
+
+    await asyncio.gather(*(asyncio.to_thread(load_group, indexes) for indexes in groups.values()))
+    return cast(List[Type[Plugin]], results)
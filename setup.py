@@ -41,6 +41,7 @@ setup(
         "semantic-kernel[mcp]",
         "python-dotenv",
         "aiohttp",
+        "numpy",
         "jsonschema",
         "pyyaml",
         "requests",
@@ -120,3 +120,17 @@ async def test_agent_error_context_creation(test_agent_config):
     assert context.details["agent_id"] == agent.id
     assert context.details["agent_name"] == agent.name
     assert context.details["extra_detail"] == "test"
+
+
+@pytest.mark.asyncio
+async def test_agent_close_closes_provider(test_agent_config):
+    """Test that closing the agent releases the provider's connections."""
+    agent = Agent(test_agent_config)
+    provider = MagicMock()
+    provider.aclose = AsyncMock()
+    agent.provider = provider
+
+    await agent.close()
+
+    provider.aclose.assert_awaited_once()
+    assert agent.provider is None
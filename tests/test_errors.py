@@ -13,6 +13,8 @@ from agently.errors import (
     ErrorHandlerConfig,
     ErrorSeverity,
     ModelError,
+    PermanentModelError,
+    RateLimitError,
     RetryConfig,
     RetryHandler,
 )
@@ -144,3 +146,51 @@ async def test_retry_handler_generator():
 
     assert results == ["0", "1", "2"]
     assert attempts == 2  # Should succeed on second attempt
+
+
+@pytest.mark.asyncio
+async def test_retry_handler_honors_retry_after():
+    """Test that a retry_after hint overrides backoff, capped at max_delay."""
+    retry_config = RetryConfig(
+        max_attempts=3, initial_delay=0.1, max_delay=5.0, jitter=0
+    )
+    handler = RetryHandler(retry_config)
+    context = ErrorContext("test", "test_op")
+    attempts = 0
+
+    async def rate_limited_operation():
+        nonlocal attempts
+        attempts += 1
+        if attempts == 1:
+            raise RateLimitError("Slow down", retry_after=2.0)
+        if attempts == 2:
+            raise RateLimitError("Slow down", retry_after=60.0)
+        return "success"
+
+    with patch("agently.errors.handler.asyncio.sleep") as mock_sleep:
+        mock_sleep.return_value = None
+        result = await handler.retry(rate_limited_operation, context)
+
+    assert result == "success"
+    assert [call.args[0] for call in mock_sleep.call_args_list] == [2.0, 5.0]
+
+
+@pytest.mark.asyncio
+async def test_retry_handler_skips_permanent_errors():
+    """Test that non-retryable errors are raised without further attempts."""
+    retry_config = RetryConfig(
+        max_attempts=3, initial_delay=0.1, max_delay=0.3, jitter=0
+    )
+    handler = RetryHandler(retry_config)
+    context = ErrorContext("test", "test_op")
+    attempts = 0
+
+    async def failing_operation():
+        nonlocal attempts
+        attempts += 1
+        raise PermanentModelError("Model not found")
+
+    with pytest.raises(PermanentModelError):
+        await handler.retry(failing_operation, context)
+
+    assert attempts == 1
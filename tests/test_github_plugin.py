@@ -1,6 +1,7 @@
 """Tests for GitHub plugin source functionality."""
 
 import os
+import sys
 import tempfile
 from pathlib import Path
 from unittest.mock import patch, MagicMock
@@ -9,7 +10,7 @@ import pytest
 import yaml
 
 from agently.config.parser import load_agent_config
-from agently.plugins.sources import GitHubPluginSource
+from agently.plugins.sources import GitHubPluginSource, prepare_github_sources
 
 
 @pytest.fixture
@@ -99,6 +100,40 @@ def test_github_plugin_source_formats():
     assert source6.plugin_type == "mcp"
 
 
+def test_github_plugin_source_rejects_bare_host():
+    """Test that github.com is never taken as the user when the repo part is missing."""
+    with pytest.raises(ValueError, match="Invalid GitHub repository format"):
+        GitHubPluginSource(repo_url="github.com/hello")
+    with pytest.raises(ValueError, match="Invalid GitHub repository format"):
+        GitHubPluginSource(repo_url="https://github.com/hello")
+
+
+@pytest.mark.parametrize(
+    "repo_url",
+    [
+        "testuser/agently-plugin-hello",
+        "github.com/testuser/agently-plugin-hello",
+        "https://github.com/testuser/agently-plugin-hello",
+        "http://github.com/testuser/agently-plugin-hello",
+        "https://github.com/testuser/agently-plugin-hello/tree/main",
+    ],
+)
+def test_github_plugin_source_accepts_url(repo_url):
+    """Test that supported repository URL forms all resolve to the same user and plugin."""
+    source = GitHubPluginSource(repo_url=repo_url)
+    assert (source.namespace, source.name) == ("testuser", "hello")
+
+
+@pytest.mark.parametrize(
+    "repo_url",
+    ["", "hello", "testuser/", "/hello", "github.com/hello", "https://github.com/hello", "https://github.com/"],
+)
+def test_github_plugin_source_rejects_url(repo_url):
+    """Test that URLs without both a user and a repository are rejected."""
+    with pytest.raises(ValueError, match="Invalid GitHub repository format"):
+        GitHubPluginSource(repo_url=repo_url)
+
+
 @patch("agently.plugins.sources.GitHubPluginSource.load")
 def test_load_github_plugin_config(mock_load, temp_github_yaml_config):
     """Test loading agent config with GitHub plugins."""
@@ -145,3 +180,369 @@ def test_load_github_plugin_config(mock_load, temp_github_yaml_config):
     assert plugin4.source.version == "main"
     assert plugin4.source.plugin_type == "mcp"
     assert plugin4.variables == {"default_name": "MCPFriend"}
+
+
+@pytest.fixture
+def git_plugin_repo(tmp_path):
+    """Create a git repository with one commit laid out as a cached plugin."""
+    import subprocess
+
+    repo_dir = tmp_path / "plugins" / "hello"
+    repo_dir.mkdir(parents=True)
+    (repo_dir / "__init__.py").write_text("")
+    git = ["git", "-C", str(repo_dir), "-c", "user.name=Test", "-c", "user.email=test@example.com"]
+    subprocess.run(git[:3] + ["init", "-q"], check=True)
+    subprocess.run(git + ["add", "."], check=True)
+    subprocess.run(git + ["commit", "-q", "-m", "Initial commit"], check=True)
+    sha = subprocess.run(git[:3] + ["rev-parse", "HEAD"], capture_output=True, text=True, check=True).stdout.strip()
+    return repo_dir, sha
+
+
+def test_github_plugin_repo_sha(git_plugin_repo):
+    """Test reading the checked out commit of a cached plugin repository."""
+    repo_dir, sha = git_plugin_repo
+    source = GitHubPluginSource(repo_url="testuser/hello", cache_dir=repo_dir.parent)
+
+    assert source._get_current_sha() == sha
+    assert source._git_meta["inside_work_tree"]
+    assert not source.needs_update(sha)
+    assert source.needs_update("0" * 40)
+
+    # Directories inside a repository, or missing entirely, aren't plugin repositories
+    (repo_dir / "nested").mkdir()
+    assert source._get_repo_sha(repo_dir / "nested") == ""
+    assert source._get_repo_sha(repo_dir / "missing") == ""
+
+
+def test_github_plugin_repo_sha_without_git(git_plugin_repo):
+    """Test that HEAD is resolved from loose and packed refs without spawning git."""
+    import subprocess
+
+    repo_dir, sha = git_plugin_repo
+    source = GitHubPluginSource(repo_url="testuser/hello", cache_dir=repo_dir.parent)
+
+    with patch("agently.plugins.sources.subprocess.run") as mock_run:
+        assert source._get_repo_sha(repo_dir) == sha
+        subprocess.check_call(["git", "-C", str(repo_dir), "pack-refs", "--all"])
+        assert source._get_repo_sha(repo_dir) == sha
+        mock_run.assert_not_called()
+
+    # A detached HEAD holds the SHA itself
+    subprocess.check_call(["git", "-C", str(repo_dir), "checkout", "-q", "--detach"])
+    with patch("agently.plugins.sources.subprocess.run") as mock_run:
+        assert source._get_repo_sha(repo_dir) == sha
+        mock_run.assert_not_called()
+
+
+def test_github_plugin_pinned_sha(git_plugin_repo):
+    """Test that a version pinned to a commit SHA is checked against HEAD only."""
+    repo_dir, sha = git_plugin_repo
+    source = GitHubPluginSource(repo_url="testuser/hello", version=sha, cache_dir=repo_dir.parent)
+
+    assert source._version_is_sha
+    assert not GitHubPluginSource(repo_url="testuser/hello", version="main")._version_is_sha
+    assert not source.needs_update("")
+    assert GitHubPluginSource(repo_url="testuser/hello", version="f" * 40, cache_dir=repo_dir.parent).needs_update(sha)
+
+    # Already at the pinned commit, so there is nothing to fetch
+    with patch("agently.plugins.sources.subprocess.run") as mock_run:
+        source._clone_or_update_repo(repo_dir)
+        mock_run.assert_not_called()
+
+
+def test_github_plugin_source_uses_slots():
+    """Test that GitHub plugin sources don't carry a per-instance __dict__."""
+    source = GitHubPluginSource(repo_url="testuser/hello")
+
+    assert not hasattr(source, "__dict__")
+    with pytest.raises(AttributeError):
+        source.unexpected_attribute = True
+
+
+def test_github_plugin_missing_dir_needs_update(tmp_path):
+    """Test that a plugin that isn't installed needs an update without spawning git."""
+    source = GitHubPluginSource(repo_url="testuser/hello", cache_dir=tmp_path)
+
+    with patch("agently.plugins.sources.subprocess.run") as mock_run:
+        assert source.needs_update("0" * 40)
+        mock_run.assert_not_called()
+
+
+def test_github_plugin_shallow_clone(git_plugin_repo, tmp_path):
+    """Test that a branch or tag version is cloned with only its latest commit."""
+    import subprocess
+
+    repo_dir, sha = git_plugin_repo
+    subprocess.check_call(["git", "-C", str(repo_dir), "branch", "-M", "main"])
+    subprocess.check_call(["git", "-C", str(repo_dir), "tag", "v1.0.0"])
+
+    # A tag is found with the common "v" prefix added
+    source = GitHubPluginSource(repo_url="testuser/hello", version="1.0.0", cache_dir=tmp_path / "cache")
+    clone_dir = tmp_path / "cache" / "hello"
+    assert source._shallow_clone(repo_dir.as_uri(), clone_dir)
+    assert source._get_repo_sha(clone_dir) == sha
+    assert (clone_dir / ".git" / "shallow").exists()
+
+    # Versions that aren't branches or tags are left to a full clone
+    missing = GitHubPluginSource(repo_url="testuser/hello", version="missing", cache_dir=tmp_path / "other")
+    assert not missing._shallow_clone(repo_dir.as_uri(), tmp_path / "other" / "hello")
+    assert not (tmp_path / "other" / "hello").exists()
+
+
+def test_shallow_clone_disables_credential_prompts(tmp_path):
+    """Test that clones can't hang waiting for credentials."""
+    source = GitHubPluginSource(repo_url="testuser/hello", cache_dir=tmp_path)
+
+    with patch("agently.plugins.sources.subprocess.run") as mock_run:
+        mock_run.return_value.returncode = 0
+        assert source._shallow_clone("https://github.com/testuser/agently-plugin-hello", tmp_path / "hello")
+
+    assert mock_run.call_args.kwargs["env"]["GIT_TERMINAL_PROMPT"] == "0"
+
+
+def test_prepare_github_sources(tmp_path):
+    """Test that prepare_github_sources clones every source and reports errors per source."""
+    sources = [
+        GitHubPluginSource(repo_url="testuser/hello", cache_dir=tmp_path),
+        GitHubPluginSource(repo_url="testuser/broken", cache_dir=tmp_path),
+        GitHubPluginSource(repo_url="testuser/world", cache_dir=tmp_path),
+    ]
+    error = RuntimeError("clone failed")
+
+    def clone(self, cache_path):
+        if self.name == "broken":
+            raise error
+
+    with patch.object(GitHubPluginSource, "_clone_or_update_repo", autospec=True, side_effect=clone) as mock_clone:
+        assert prepare_github_sources(sources) == [None, error, None]
+        assert mock_clone.call_count == 3
+
+    assert [source._prepared for source in sources] == [True, False, True]
+    assert prepare_github_sources([]) == []
+
+
+def test_github_plugin_force_reinstall_reuses_clone(git_plugin_repo, tmp_path):
+    """Test that force_reinstall resets an existing clone instead of cloning again."""
+    import subprocess
+
+    repo_dir, _ = git_plugin_repo
+    subprocess.check_call(["git", "-C", str(repo_dir), "branch", "-M", "main"])
+    source = GitHubPluginSource(repo_url="testuser/hello", force_reinstall=True, cache_dir=tmp_path / "cache")
+    clone_dir = tmp_path / "cache" / "hello"
+    assert source._shallow_clone(repo_dir.as_uri(), clone_dir)
+
+    # A new upstream commit, plus local changes that a reinstall must discard
+    (repo_dir / "plugin.py").write_text("VALUE = 2\n")
+    git = ["git", "-C", str(repo_dir), "-c", "user.name=Test", "-c", "user.email=test@example.com"]
+    subprocess.check_call(git + ["add", "."])
+    subprocess.check_call(git + ["commit", "-q", "-m", "Update"])
+    new_sha = subprocess.check_output(["git", "-C", str(repo_dir), "rev-parse", "HEAD"], text=True).strip()
+    (clone_dir / "__init__.py").write_text("broken")
+    (clone_dir / "stray.py").write_text("")
+    (clone_dir / ".git" / "marker").write_text("")
+
+    source._clone_or_update_repo(clone_dir)
+
+    assert source._get_repo_sha(clone_dir) == new_sha
+    assert (clone_dir / "__init__.py").read_text() == ""
+    assert not (clone_dir / "stray.py").exists()
+    assert (clone_dir / ".git" / "marker").exists()
+
+    # The shallow clone is updated by a depth 1 fetch, so it stays a single commit
+    history = subprocess.check_output(["git", "-C", str(clone_dir), "rev-list", "--count", "HEAD"], text=True)
+    assert history.strip() == "1"
+
+
+def test_github_plugin_force_reinstall_updates_full_clone(git_plugin_repo, tmp_path):
+    """Test that force_reinstall moves a full clone to the remote branch or to a tag."""
+    import subprocess
+
+    repo_dir, first_sha = git_plugin_repo
+    subprocess.check_call(["git", "-C", str(repo_dir), "branch", "-M", "main"])
+    subprocess.check_call(["git", "-C", str(repo_dir), "tag", "v1.0.0"])
+    clone_dir = tmp_path / "cache" / "hello"
+    subprocess.check_call(["git", "clone", "-q", repo_dir.as_uri(), str(clone_dir)])
+
+    (repo_dir / "plugin.py").write_text("VALUE = 2\n")
+    git = ["git", "-C", str(repo_dir), "-c", "user.name=Test", "-c", "user.email=test@example.com"]
+    subprocess.check_call(git + ["add", "."])
+    subprocess.check_call(git + ["commit", "-q", "-m", "Update"])
+    new_sha = subprocess.check_output(["git", "-C", str(repo_dir), "rev-parse", "HEAD"], text=True).strip()
+
+    branch = GitHubPluginSource(repo_url="testuser/hello", force_reinstall=True, cache_dir=tmp_path / "cache")
+    assert branch._force_update_repo(clone_dir)
+    assert branch._get_repo_sha(clone_dir) == new_sha
+
+    tag = GitHubPluginSource(
+        repo_url="testuser/hello", version="1.0.0", force_reinstall=True, cache_dir=tmp_path / "cache"
+    )
+    assert tag._force_update_repo(clone_dir)
+    assert tag._get_repo_sha(clone_dir) == first_sha
+
+
+def test_github_plugin_update_keeps_shallow_clone_shallow(git_plugin_repo, tmp_path):
+    """Test that updating a shallow clone fetches only the version's latest commit."""
+    import subprocess
+
+    repo_dir, _ = git_plugin_repo
+    subprocess.check_call(["git", "-C", str(repo_dir), "branch", "-M", "main"])
+    source = GitHubPluginSource(repo_url="testuser/hello", cache_dir=tmp_path / "cache")
+    clone_dir = tmp_path / "cache" / "hello"
+    assert source._shallow_clone(repo_dir.as_uri(), clone_dir)
+
+    (repo_dir / "plugin.py").write_text("VALUE = 2\n")
+    git = ["git", "-C", str(repo_dir), "-c", "user.name=Test", "-c", "user.email=test@example.com"]
+    subprocess.check_call(git + ["add", "."])
+    subprocess.check_call(git + ["commit", "-q", "-m", "Update"])
+    new_sha = subprocess.check_output(["git", "-C", str(repo_dir), "rev-parse", "HEAD"], text=True).strip()
+
+    source._clone_or_update_repo(clone_dir)
+
+    assert source._get_repo_sha(clone_dir) == new_sha
+    history = subprocess.check_output(["git", "-C", str(clone_dir), "rev-list", "--count", "HEAD"], text=True)
+    assert history.strip() == "1"
+
+
+def test_import_package_leaves_sys_path_alone(tmp_path, monkeypatch):
+    """Test that package plugins are imported by path, with working relative imports."""
+    from agently.plugins.sources import _import_package
+
+    package_dir = tmp_path / "agently_path_plugin"
+    package_dir.mkdir()
+    (package_dir / "__init__.py").write_text("from .helpers import VALUE\n")
+    (package_dir / "helpers.py").write_text("VALUE = 1\n")
+    monkeypatch.delitem(sys.modules, "agently_path_plugin", raising=False)
+    monkeypatch.delitem(sys.modules, "agently_path_plugin.helpers", raising=False)
+    sys_path = list(sys.path)
+
+    module = _import_package("agently_path_plugin", package_dir)
+
+    assert module.VALUE == 1
+    assert sys.path == sys_path
+    assert _import_package("agently_path_plugin", package_dir) is module
+
+
+@pytest.mark.parametrize("plugin_path", ["plugin.py", "pkg"])
+def test_github_plugins_sharing_a_name_get_their_own_modules(tmp_path, plugin_path):
+    """Test that same-named GitHub plugins from different repositories don't replace each other's module."""
+    plugin_code = (
+        "class HelloPlugin:\n"
+        "    name = 'hello'\n"
+        "    description = 'Hello plugin'\n"
+        "    plugin_instructions = ''\n"
+        "    OWNER = {owner!r}\n"
+        "    @classmethod\n"
+        "    def get_kernel_functions(cls):\n"
+        "        return {{}}\n"
+    )
+    classes = []
+    for owner in ["alice", "bob"]:
+        cache_dir = tmp_path / owner
+        module_file = cache_dir / "hello" / ("plugin.py" if plugin_path == "plugin.py" else "pkg/__init__.py")
+        module_file.parent.mkdir(parents=True)
+        module_file.write_text(plugin_code.format(owner=owner))
+
+        source = GitHubPluginSource(repo_url=f"{owner}/hello", plugin_path=plugin_path, cache_dir=cache_dir)
+        source._prepared = True
+        classes.append(source.load())
+
+    alice, bob = classes
+    assert (alice.OWNER, bob.OWNER) == ("alice", "bob")
+    assert alice.__module__ != bob.__module__
+    assert sys.modules[alice.__module__].HelloPlugin is alice
+    assert sys.modules[bob.__module__].HelloPlugin is bob
+
+
+def test_find_plugin_class():
+    """Test that only plugin-like classes defined in the module itself are found."""
+    import types
+
+    from agently.plugins.sources import _find_plugin_class
+
+    module = types.ModuleType("agently_scan_plugin")
+    exec(
+        "from unittest.mock import MagicMock\n"
+        "class Helper:\n"
+        "    name = 'helper'\n"
+        "class HelloPlugin:\n"
+        "    name = 'hello'\n"
+        "    description = 'Says hello'\n"
+        "    plugin_instructions = ''\n"
+        "    @classmethod\n"
+        "    def get_kernel_functions(cls):\n"
+        "        return {}\n",
+        module.__dict__,
+    )
+
+    assert _find_plugin_class(module) is module.HelloPlugin
+    assert _find_plugin_class(types.ModuleType("agently_empty_plugin")) is None
+
+
+def test_github_mcp_plugin_class_is_reused(tmp_path):
+    """Test that an MCP server's placeholder plugin class is only built once."""
+    source = GitHubPluginSource(repo_url="testuser/mcp-hello", plugin_type="mcp", cache_dir=tmp_path)
+
+    with patch.object(GitHubPluginSource, "_clone_or_update_repo"):
+        plugin_class = source.load()
+        assert source.load() is plugin_class
+
+    assert plugin_class.name == "mcp-hello"
+    assert plugin_class.namespace == "testuser"
+    assert plugin_class.get_kernel_functions() == {}
+
+
+def test_github_plugin_load_is_memoized(tmp_path):
+    """Test that loading a source again skips git until it is prepared or reinstalled."""
+    source = GitHubPluginSource(repo_url="testuser/mcp-hello", plugin_type="mcp", cache_dir=tmp_path)
+
+    with patch.object(GitHubPluginSource, "_clone_or_update_repo") as mock_clone:
+        plugin_class = source.load()
+        assert source.load() is plugin_class
+        assert mock_clone.call_count == 1
+
+        source.force_reinstall = True
+        source.load()
+        assert mock_clone.call_count == 2
+
+
+def test_github_plugin_checkout_version(git_plugin_repo, tmp_path):
+    """Test that branches, tags and 'v'-prefixed tags are resolved locally and checked out."""
+    import subprocess
+
+    repo_dir, first_sha = git_plugin_repo
+    git = ["git", "-C", str(repo_dir), "-c", "user.name=Test", "-c", "user.email=test@example.com"]
+    subprocess.check_call(git[:3] + ["branch", "-M", "main"])
+    subprocess.check_call(git[:3] + ["tag", "v1.0.0"])
+    (repo_dir / "plugin.py").write_text("VALUE = 2\n")
+    subprocess.check_call(git + ["add", "."])
+    subprocess.check_call(git + ["commit", "-q", "-m", "Update"])
+    main_sha = subprocess.check_output(git[:3] + ["rev-parse", "HEAD"], text=True).strip()
+
+    clone_dir = tmp_path / "hello"
+    subprocess.check_call(["git", "clone", "-q", str(repo_dir), str(clone_dir)])
+
+    for version, expected in [("1.0.0", first_sha), ("main", main_sha), (first_sha[:12], first_sha)]:
+        source = GitHubPluginSource(repo_url="testuser/hello", version=version, cache_dir=tmp_path)
+        source._checkout_version(clone_dir)
+        assert source._get_repo_sha(clone_dir) == expected
+
+    source = GitHubPluginSource(repo_url="testuser/hello", version="missing", cache_dir=tmp_path)
+    with pytest.raises(RuntimeError):
+        source._checkout_version(clone_dir)
+
+
+def test_github_plugin_repo_sha_is_cached(git_plugin_repo):
+    """Test that HEAD is only read again once it changes or the repository is updated."""
+    repo_dir, sha = git_plugin_repo
+    source = GitHubPluginSource(repo_url="testuser/hello", cache_dir=repo_dir.parent)
+    assert source._get_current_sha() == sha
+
+    with patch("agently.plugins.sources._read_head_sha") as mock_read:
+        assert source._get_current_sha() == sha
+        mock_read.assert_not_called()
+
+    with patch.object(GitHubPluginSource, "_checkout_version"), patch("agently.plugins.sources.subprocess.run"):
+        source._clone_or_update_repo(repo_dir)
+    with patch("agently.plugins.sources._read_head_sha", return_value="f" * 40) as mock_read:
+        assert source._get_current_sha() == "f" * 40
+        mock_read.assert_called_once()
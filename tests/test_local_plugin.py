@@ -1,5 +1,6 @@
 """Tests for local plugin source functionality."""
 
+import json
 import os
 import tempfile
 from pathlib import Path
@@ -9,7 +10,7 @@ import pytest
 import yaml
 
 from agently.config.parser import load_agent_config
-from agently.plugins.sources import LocalPluginSource
+from agently.plugins.sources import LocalPluginSource, load_many
 
 
 @pytest.fixture
@@ -94,6 +95,10 @@ def test_local_plugin_source_path_handling():
     assert source3.path.name == "mcp-server"
     assert source3.plugin_type == "mcp"
 
+    # String paths are converted once, at construction
+    source4 = LocalPluginSource("./plugins/hello")
+    assert source4.path == Path("./plugins/hello")
+
 
 @patch("agently.plugins.sources.importlib.util.spec_from_file_location")
 @patch("agently.plugins.sources.importlib.util.module_from_spec")
@@ -223,3 +228,382 @@ def test_local_plugin_source_error_handling():
         with pytest.raises(ImportError) as excinfo:
             source2.load()
         assert "must be a .py file or directory with __init__.py" in str(excinfo.value)
+
+
+def test_local_plugin_sha_accepts_legacy_lockfile_hashes(mock_plugin_dir):
+    """Test that untagged SHA-256 lockfile values still match after switching hash algorithms."""
+    import hashlib
+
+    source = LocalPluginSource(path=mock_plugin_dir)
+    init_file = mock_plugin_dir / "__init__.py"
+    legacy_sha = hashlib.sha256(b"__init__.py" + init_file.read_bytes()).hexdigest()
+
+    assert source._legacy_plugin_sha() == legacy_sha
+    assert source._sha_matches("b3:0123", legacy_sha)
+    assert not source._sha_matches("b3:0123", "0" * 64)
+    assert not source._sha_matches("b3:0123", "b3:4567")
+
+
+def test_local_plugin_sha_streams_in_chunks(mock_plugin_dir, monkeypatch):
+    """Test that chunked hashing produces the same digest as hashing whole files."""
+    import hashlib
+
+    monkeypatch.setattr("agently.plugins.sources._HASH_CHUNK_SIZE", 7)
+    init_file = mock_plugin_dir / "__init__.py"
+
+    expected = hashlib.sha256(init_file.read_bytes()).hexdigest()
+    assert LocalPluginSource(path=init_file)._hash_plugin("sha256") == f"sha256:{expected}"
+
+
+def test_local_plugin_directory_sha_combines_file_digests(mock_plugin_dir, monkeypatch):
+    """Test that directory hashes cover each file's path and contents."""
+    import hashlib
+
+    (mock_plugin_dir / "sub").mkdir()
+    (mock_plugin_dir / "sub" / "helpers.py").write_text("VALUE = 1\n")
+    source = LocalPluginSource(path=mock_plugin_dir)
+
+    expected = hashlib.sha256()
+    for rel_path in ["__init__.py", "sub/helpers.py"]:
+        expected.update(len(rel_path).to_bytes(4, "little") + rel_path.encode())
+        expected.update(hashlib.sha256((mock_plugin_dir / rel_path).read_bytes()).digest())
+    assert source._hash_plugin("sha256") == f"sha256:{expected.hexdigest()}"
+
+    # Large plugins hash their files in parallel, to the same result
+    monkeypatch.setattr("agently.plugins.sources._SEQUENTIAL_HASH_MAX_BYTES", 0)
+    monkeypatch.setattr("agently.plugins.sources.os.cpu_count", lambda: 2)
+    assert source._hash_plugin("sha256") == f"sha256:{expected.hexdigest()}"
+
+    (mock_plugin_dir / "sub" / "helpers.py").write_text("VALUE = 2\n")
+    assert source._hash_plugin("sha256") != f"sha256:{expected.hexdigest()}"
+
+
+def test_local_plugin_sha_is_cached_until_files_change(mock_plugin_dir):
+    """Test that the plugin SHA is only recalculated when files change."""
+    source = LocalPluginSource(path=mock_plugin_dir)
+    first = source._calculate_plugin_sha()
+
+    with patch.object(LocalPluginSource, "_hash_plugin") as mock_hash:
+        assert source._calculate_plugin_sha() == first
+        mock_hash.assert_not_called()
+
+    (mock_plugin_dir / "extra.py").write_text("VALUE = 1\n")
+    second = source._calculate_plugin_sha()
+    assert second != first
+    assert source._calculate_plugin_sha() == second
+
+
+def test_local_plugin_load_reuses_unchanged_module(mock_plugin_dir):
+    """Test that reloading an unchanged plugin doesn't execute its module again."""
+    plugin_class = LocalPluginSource(mock_plugin_dir).load()
+    assert plugin_class.__name__ == "MockPlugin"
+
+    with patch("agently.plugins.sources.importlib.util.spec_from_file_location") as mock_spec_from_file:
+        assert LocalPluginSource(mock_plugin_dir).load() is plugin_class
+        mock_spec_from_file.assert_not_called()
+
+    # Any change to the plugin's files loads it afresh
+    (mock_plugin_dir / "helpers.py").write_text("VALUE = 1\n")
+    assert LocalPluginSource(mock_plugin_dir).load() is not plugin_class
+
+
+def test_local_plugin_load_cache_keeps_latest_class(mock_plugin_dir):
+    """Test that reloading a changed plugin replaces its cached class instead of adding another."""
+    from agently.plugins.sources import _LOAD_CACHE
+
+    source = LocalPluginSource(mock_plugin_dir, name="cached", namespace="latest")
+    first = source.load()
+    (mock_plugin_dir / "helpers.py").write_text("VALUE = 1\n")
+    second = source.load()
+
+    assert second is not first
+    entries = [cached for key, cached in _LOAD_CACHE.items() if key[1:] == ("latest", "cached")]
+    assert [plugin_class for _, plugin_class in entries] == [second]
+
+
+def test_local_plugin_load_keeps_names_per_source(mock_plugin_dir):
+    """Test that sources naming the same plugin files differently don't rename each other's class."""
+    first = LocalPluginSource(mock_plugin_dir, name="first", namespace="one").load()
+    second = LocalPluginSource(mock_plugin_dir, name="second", namespace="two").load()
+
+    assert second is not first
+    assert (first.namespace, first.name) == ("one", "first")
+    assert (second.namespace, second.name) == ("two", "second")
+
+    # Loading again under the first name reuses its class unchanged
+    assert LocalPluginSource(mock_plugin_dir, name="first", namespace="one").load() is first
+    assert (second.namespace, second.name) == ("two", "second")
+
+
+def test_lockfile_parse_is_cached(tmp_path):
+    """Test that an unchanged lockfile is only parsed once."""
+    from agently.plugins.sources import _load_lockfile
+
+    lockfile_path = tmp_path / "agently.lockfile.json"
+    lockfile_path.write_text('{"plugins": {"sk": {}, "mcp": {}}}')
+    first = _load_lockfile(lockfile_path)
+
+    with patch("agently.plugins.sources._json_loads") as mock_loads:
+        assert _load_lockfile(lockfile_path) is first
+        mock_loads.assert_not_called()
+
+    lockfile_path.write_text('{"plugins": {"sk": {"local/hello": {}}, "mcp": {}}}')
+    assert _load_lockfile(lockfile_path)["plugins"]["sk"] == {"local/hello": {}}
+
+
+def test_written_lockfile_is_not_parsed_again(tmp_path):
+    """Test that a lockfile written through write_lockfile is reused on the next read."""
+    from agently.plugins.sources import _load_lockfile, write_lockfile
+
+    lockfile_path = tmp_path / "agently.lockfile.json"
+    lockfile = {"plugins": {"sk": {"local/hello": {"sha": "b3:0123"}}, "mcp": {}}}
+    write_lockfile(lockfile_path, lockfile)
+
+    with patch("agently.plugins.sources._json_loads") as mock_loads:
+        assert _load_lockfile(lockfile_path) == lockfile
+        mock_loads.assert_not_called()
+    assert json.loads(lockfile_path.read_text()) == lockfile
+
+    # The caller's dict isn't shared with the cached contents
+    lockfile["plugins"]["sk"].clear()
+    assert _load_lockfile(lockfile_path)["plugins"]["sk"] == {"local/hello": {"sha": "b3:0123"}}
+
+
+def test_write_lockfile_skips_unchanged_contents(tmp_path):
+    """Test that rewriting identical lockfile contents leaves the file untouched."""
+    from agently.plugins.sources import write_lockfile
+
+    lockfile_path = tmp_path / "agently.lockfile.json"
+    lockfile = {"plugins": {"sk": {}, "mcp": {}}}
+    write_lockfile(lockfile_path, lockfile)
+    os.utime(lockfile_path, ns=(0, 0))
+
+    write_lockfile(lockfile_path, {"plugins": {"sk": {}, "mcp": {}}})
+    assert lockfile_path.stat().st_mtime_ns == 0
+
+    write_lockfile(lockfile_path, {"plugins": {"sk": {"local/hello": {}}, "mcp": {}}})
+    assert lockfile_path.stat().st_mtime_ns != 0
+    assert [path.name for path in tmp_path.iterdir()] == ["agently.lockfile.json"]
+
+
+def test_local_plugin_load_without_lockfile_skips_hashing(mock_plugin_dir, tmp_path, monkeypatch):
+    """Test that a plugin isn't hashed on load when there is no lockfile SHA to compare."""
+    monkeypatch.chdir(tmp_path)
+
+    with patch.object(LocalPluginSource, "_hash_plugin") as mock_hash:
+        assert LocalPluginSource(mock_plugin_dir).load().__name__ == "MockPlugin"
+        mock_hash.assert_not_called()
+
+
+def test_local_plugin_load_hashes_once(mock_plugin_dir, tmp_path, monkeypatch):
+    """Test that one load walks the plugin once and reuses its SHA for the lockfile."""
+    from agently.plugins.sources import _scan_python_files
+
+    monkeypatch.chdir(tmp_path)
+    source = LocalPluginSource(mock_plugin_dir, name="mock_plugin")
+    sha = LocalPluginSource(mock_plugin_dir)._calculate_plugin_sha()
+    lockfile = {"plugins": {"sk": {"local/mock_plugin": {"sha": sha}}, "mcp": {}}}
+    (tmp_path / "agently.lockfile.json").write_text(json.dumps(lockfile))
+
+    with patch("agently.plugins.sources._scan_python_files", wraps=_scan_python_files) as mock_scan:
+        plugin_class = source.load()
+        assert mock_scan.call_count == 1
+
+    with patch.object(LocalPluginSource, "_hash_plugin") as mock_hash:
+        assert source._get_plugin_info(plugin_class)["sha"] == sha
+        mock_hash.assert_not_called()
+
+
+def test_local_plugin_sha_persists_between_runs(mock_plugin_dir, tmp_path):
+    """Test that a SHA stored by an earlier run is reused until a plugin file changes."""
+    cache_dir = tmp_path / ".agently" / "plugins" / "sk"
+    cache_dir.mkdir(parents=True)
+    sha = LocalPluginSource(mock_plugin_dir, cache_dir=cache_dir)._calculate_plugin_sha()
+    assert (cache_dir.parent / ".shacache.json").exists()
+
+    with patch("agently.plugins.sources._hash_file") as mock_hash:
+        assert LocalPluginSource(mock_plugin_dir, cache_dir=cache_dir)._calculate_plugin_sha() == sha
+        mock_hash.assert_not_called()
+
+    (mock_plugin_dir / "helpers.py").write_text("VALUE = 1\n")
+    assert LocalPluginSource(mock_plugin_dir, cache_dir=cache_dir)._calculate_plugin_sha() != sha
+
+
+def test_local_plugin_sha_rehashes_only_changed_files(mock_plugin_dir, tmp_path):
+    """Test that after a change, only the changed file is read again to recompute the SHA."""
+    from agently.plugins.sources import _hash_file
+
+    cache_dir = tmp_path / ".agently" / "plugins" / "sk"
+    cache_dir.mkdir(parents=True)
+    (mock_plugin_dir / "helpers.py").write_text("VALUE = 1\n")
+    (mock_plugin_dir / "other.py").write_text("OTHER = 1\n")
+    LocalPluginSource(mock_plugin_dir, cache_dir=cache_dir)._calculate_plugin_sha()
+
+    (mock_plugin_dir / "helpers.py").write_text("VALUE = 22\n")
+    with patch("agently.plugins.sources._hash_file", wraps=_hash_file) as mock_hash:
+        sha = LocalPluginSource(mock_plugin_dir, cache_dir=cache_dir)._calculate_plugin_sha()
+    assert [call.args[1] for call in mock_hash.call_args_list] == [mock_plugin_dir / "helpers.py"]
+
+    # The partly cached result matches hashing everything from scratch
+    assert LocalPluginSource(mock_plugin_dir)._calculate_plugin_sha() == sha
+
+
+def test_single_file_plugin_sha_skips_persisted_cache(tmp_path):
+    """Test that a single-file plugin is hashed directly, without the SHA cache file."""
+    cache_dir = tmp_path / ".agently" / "plugins" / "sk"
+    cache_dir.mkdir(parents=True)
+    plugin_file = tmp_path / "single_plugin.py"
+    plugin_file.write_text("VALUE = 1\n")
+    source = LocalPluginSource(plugin_file, cache_dir=cache_dir)
+
+    sha = source._calculate_plugin_sha()
+    assert sha
+    assert not (cache_dir.parent / ".shacache.json").exists()
+
+    # Unchanged, the in-process cache answers without reading the file again
+    with patch.object(LocalPluginSource, "_hash_plugin") as mock_hash:
+        assert source._calculate_plugin_sha() == sha
+        mock_hash.assert_not_called()
+
+
+def test_local_plugin_sha_skips_environment_dirs(mock_plugin_dir):
+    """Test that virtualenvs and caches inside a plugin don't affect its SHA."""
+    source = LocalPluginSource(path=mock_plugin_dir)
+    before = source._hash_plugin("sha256")
+
+    for skipped in [".venv/lib", "__pycache__", "node_modules/pkg"]:
+        (mock_plugin_dir / skipped).mkdir(parents=True)
+        (mock_plugin_dir / skipped / "module.py").write_text("VALUE = 1\n")
+
+    assert source._hash_plugin("sha256") == before
+
+
+def test_local_plugin_needs_update_reuses_comparison(mock_plugin_dir):
+    """Test that repeated update checks don't recompute the legacy SHA comparison."""
+    source = LocalPluginSource(path=mock_plugin_dir)
+    legacy_sha = source._legacy_plugin_sha()
+
+    assert not source.needs_update(legacy_sha)
+    with patch.object(LocalPluginSource, "_legacy_plugin_sha") as mock_legacy:
+        assert not source.needs_update(legacy_sha)
+        mock_legacy.assert_not_called()
+
+    # A changed plugin produces a new current SHA, so it is compared again
+    (mock_plugin_dir / "extra.py").write_text("VALUE = 1\n")
+    assert source.needs_update(legacy_sha)
+
+
+def test_plugin_source_uses_slots(mock_plugin_dir):
+    """Test that plugin sources don't carry a per-instance __dict__."""
+    source = LocalPluginSource(path=mock_plugin_dir, name="mock")
+
+    assert not hasattr(source, "__dict__")
+    assert repr(source) == "LocalPluginSource(name='mock', force_reinstall=False)"
+    with pytest.raises(AttributeError):
+        source.unexpected_attribute = True
+
+
+def test_local_plugin_prefers_plugin_subclass(tmp_path):
+    """Test that a Plugin subclass wins over an earlier duck-typed class."""
+    plugin_file = tmp_path / "preferred_plugin.py"
+    plugin_file.write_text(
+        """
+from agently.plugins.base import Plugin
+
+class LooksLikeAPlugin:
+    name = "duck"
+    description = "Only has the attributes"
+    plugin_instructions = ""
+
+    @classmethod
+    def get_kernel_functions(cls):
+        return {}
+
+class RealPlugin(Plugin):
+    name = "real"
+    description = "Inherits from Plugin"
+    plugin_instructions = ""
+"""
+    )
+
+    assert LocalPluginSource(plugin_file, force_reinstall=True).load().__name__ == "RealPlugin"
+
+
+def test_local_plugin_skips_stale_subclasses(tmp_path):
+    """Test that a reload finds the module's current Plugin subclass, not one from an earlier load."""
+    plugin_file = tmp_path / "reloaded_plugin.py"
+    plugin_file.write_text(
+        """
+from agently.plugins.base import Plugin
+
+class ReloadedPlugin(Plugin):
+    name = "reloaded"
+    description = "First version"
+    plugin_instructions = ""
+"""
+    )
+    first = LocalPluginSource(plugin_file, force_reinstall=True).load()
+
+    plugin_file.write_text(plugin_file.read_text().replace("First version", "Second version"))
+    second = LocalPluginSource(plugin_file, force_reinstall=True).load()
+
+    assert first is not second
+    assert second.description == "Second version"
+
+
+@pytest.mark.asyncio
+async def test_load_many(tmp_path):
+    """Test that load_many loads every source and keeps their order."""
+    sources = []
+    for name in ("first", "second", "third"):
+        plugin_file = tmp_path / f"{name}_many_plugin.py"
+        plugin_file.write_text(
+            f"""
+from agently.plugins.base import Plugin
+
+class {name.capitalize()}Plugin(Plugin):
+    name = "{name}"
+    description = "Loaded together"
+    plugin_instructions = ""
+"""
+        )
+        sources.append(LocalPluginSource(plugin_file, force_reinstall=True))
+
+    plugins = await load_many(sources)
+    assert [plugin.__name__ for plugin in plugins] == ["FirstPlugin", "SecondPlugin", "ThirdPlugin"]
+    assert await load_many([]) == []
+
+
+def test_local_plugins_with_same_file_name_stay_separate(tmp_path):
+    """Test that plugins sharing a file name get their own modules."""
+    classes = []
+    for name in ("one", "two"):
+        plugin_dir = tmp_path / name
+        plugin_dir.mkdir()
+        (plugin_dir / "plugin.py").write_text(
+            f"""
+from agently.plugins.base import Plugin
+
+class SameNamePlugin(Plugin):
+    name = "{name}"
+    description = "{name.capitalize()} of two plugins named plugin.py"
+    plugin_instructions = ""
+"""
+        )
+        classes.append(LocalPluginSource(plugin_dir / "plugin.py", force_reinstall=True).load())
+
+    assert classes[0].__module__ != classes[1].__module__
+    assert [plugin.description for plugin in classes] == ["One of two plugins named plugin.py", "Two of two plugins named plugin.py"]
+
+
+def test_failed_local_plugin_import_is_not_left_in_sys_modules(tmp_path):
+    """Test that a plugin module that fails to execute is removed from sys.modules."""
+    import sys
+
+    plugin_file = tmp_path / "failing_plugin.py"
+    plugin_file.write_text("raise RuntimeError('broken plugin')\n")
+
+    with pytest.raises(ImportError, match="broken plugin"):
+        LocalPluginSource(plugin_file, force_reinstall=True).load()
+
+    assert not [name for name in sys.modules if name.startswith("failing_plugin")]
@@ -0,0 +1,434 @@
+"""Tests for Ollama provider functionality."""
+
+import asyncio
+from unittest.mock import AsyncMock, patch
+
+import numpy as np
+import pytest
+from aiohttp import web
+
+from agently.config.types import ModelConfig
+from agently.errors import ModelError, PermanentModelError
+from agently.models.embedding_cache import EmbeddingCache, embedding_cache_key
+from agently.models.ollama import OllamaProvider, _EmbedBatcher
+from agently.models.ollama_embeddings import parse_embedding
+
+
+@pytest.fixture
+def ollama_config():
+    """Create a test Ollama configuration."""
+    return ModelConfig(provider="ollama", model="nomic-embed-text", temperature=0.7)
+
+
+@pytest.fixture
+async def ollama_server(monkeypatch):
+    """Serve a fake Ollama embeddings endpoint and point the provider at it."""
+    requests = []
+
+    async def embeddings(request):
+        body = await request.json()
+        requests.append(body)
+        if body["model"] == "missing-model":
+            return web.json_response({"error": "model not found"}, status=404)
+        return web.json_response({"embedding": [float(len(body["prompt"])), 0.5]})
+
+    app = web.Application()
+    app.router.add_post("/api/embeddings", embeddings)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    monkeypatch.setenv("OLLAMA_BASE_URL", f"http://127.0.0.1:{port}")
+
+    yield requests
+
+    await runner.cleanup()
+
+
+@pytest.mark.asyncio
+async def test_embed_batcher_coalesces_requests():
+    """Test that concurrent submissions are dispatched in one batch."""
+    calls = []
+
+    async def fetch(text):
+        calls.append(text)
+        return [float(len(text))]
+
+    batcher = _EmbedBatcher(fetch, max_wait=0.01)
+    results = await asyncio.gather(batcher.submit("a"), batcher.submit("bb"), batcher.submit("a"))
+
+    assert results == [[1.0], [2.0], [1.0]]
+    # Duplicate texts share a single request
+    assert sorted(calls) == ["a", "bb"]
+    assert batcher.pending == []
+
+
+@pytest.mark.asyncio
+async def test_embed_batcher_dispatches_full_batch_early():
+    """Test that a full batch is dispatched without waiting for the window."""
+
+    async def fetch(text):
+        return [1.0]
+
+    batcher = _EmbedBatcher(fetch, max_wait=10.0, max_batch=2)
+    results = await asyncio.wait_for(asyncio.gather(batcher.submit("a"), batcher.submit("b")), timeout=1.0)
+
+    assert results == [[1.0], [1.0]]
+
+
+@pytest.mark.asyncio
+async def test_embed_batcher_limits_dispatch_size():
+    """Test that requests beyond max_batch are left for the next dispatch."""
+    batches = []
+
+    async def fetch(text):
+        return [float(len(text))]
+
+    batcher = _EmbedBatcher(fetch, max_wait=0.01, max_batch=2)
+    dispatch = _EmbedBatcher._dispatch
+
+    async def record(self, batch):
+        batches.append([text for text, _ in batch])
+        await dispatch(self, batch)
+
+    with patch.object(_EmbedBatcher, "_dispatch", record):
+        texts = ["a", "bb", "ccc", "dddd", "eeeee"]
+        results = await asyncio.wait_for(asyncio.gather(*(batcher.submit(text) for text in texts)), timeout=1.0)
+
+    assert results == [[1.0], [2.0], [3.0], [4.0], [5.0]]
+    assert batches == [["a", "bb"], ["ccc", "dddd"], ["eeeee"]]
+
+
+def test_embed_batcher_drops_requests_from_closed_loop():
+    """Test that requests stranded on a closed event loop don't block the next loop's batch."""
+    calls = []
+
+    async def fetch(text):
+        calls.append(text)
+        return [1.0]
+
+    batcher = _EmbedBatcher(fetch, max_wait=0.01)
+
+    async def strand():
+        asyncio.ensure_future(batcher.submit("stranded"))
+        # Let the window open and start waiting
+        for _ in range(3):
+            await asyncio.sleep(0)
+
+    # The loop closes before the window does, leaving its request pending
+    old_loop = asyncio.new_event_loop()
+    old_loop.run_until_complete(strand())
+    old_loop.close()
+    assert len(batcher.pending) == 1
+
+    async def submit():
+        return await asyncio.wait_for(batcher.submit("fresh"), timeout=1.0)
+
+    assert asyncio.run(submit()) == [1.0]
+    assert calls == ["fresh"]
+    assert batcher.pending == []
+
+
+@pytest.mark.asyncio
+async def test_embed_batcher_propagates_errors():
+    """Test that a failed request only fails its own waiters."""
+
+    async def fetch(text):
+        if text == "bad":
+            raise ValueError("boom")
+        return [1.0]
+
+    batcher = _EmbedBatcher(fetch)
+    results = await asyncio.gather(batcher.submit("good"), batcher.submit("bad"), return_exceptions=True)
+
+    assert results[0] == [1.0]
+    assert isinstance(results[1], ValueError)
+
+
+@pytest.mark.asyncio
+async def test_ollama_embeddings(ollama_config):
+    """Test getting embeddings through the batcher."""
+    with patch.object(OllamaProvider, "_fetch_embedding", AsyncMock(return_value=[0.1, 0.2, 0.3])):
+        provider = OllamaProvider(ollama_config)
+        embeddings = await provider.get_embeddings("test text")
+
+    assert isinstance(embeddings, np.ndarray)
+    assert embeddings.dtype == np.float32
+    np.testing.assert_allclose(embeddings, [0.1, 0.2, 0.3], rtol=1e-6)
+
+
+@pytest.mark.asyncio
+async def test_ollama_embeddings_error(ollama_config):
+    """Test that embedding failures are surfaced as ModelError."""
+    with patch.object(OllamaProvider, "_fetch_embedding", AsyncMock(side_effect=RuntimeError("down"))):
+        provider = OllamaProvider(ollama_config)
+        with pytest.raises(ModelError) as exc_info:
+            await provider.get_embeddings("test text")
+
+    assert "Failed to get embeddings" in str(exc_info.value)
+
+
+@pytest.mark.asyncio
+async def test_ollama_function_call_in_content(ollama_config):
+    """Test that function names in streamed content are resolved exactly once."""
+    provider = OllamaProvider(ollama_config)
+    functions_by_name = provider._index_functions_by_name({"hello-greet": ("hello", "greet", object())})
+    function_results = {}
+    executed_functions = set()
+
+    with patch.object(
+        OllamaProvider, "_execute_function_with_retry", AsyncMock(return_value=(True, "Hello, Ada!", None))
+    ) as mock_execute:
+        # Partial names and plain text are not treated as function calls
+        assert await provider._process_function_call_in_content(
+            "gre", functions_by_name, function_results, executed_functions
+        ) == (False, None)
+        assert await provider._process_function_call_in_content(
+            "  ", functions_by_name, function_results, executed_functions
+        ) == (False, None)
+
+        processed, result = await provider._process_function_call_in_content(
+            "greet(name='Ada')", functions_by_name, function_results, executed_functions
+        )
+        assert processed
+        assert result == "I'll execute the greet function for you.\n\nHello, Ada!"
+
+        # A repeated call is swallowed without re-executing
+        assert await provider._process_function_call_in_content(
+            "greet", functions_by_name, function_results, executed_functions
+        ) == (True, None)
+
+    mock_execute.assert_awaited_once()
+    assert executed_functions == {"hello-greet"}
+
+
+def test_ollama_provider_uses_slots(ollama_config):
+    """Test that provider instances don't carry a per-instance __dict__."""
+    provider = OllamaProvider(ollama_config)
+
+    assert not hasattr(provider, "__dict__")
+    with pytest.raises(AttributeError):
+        provider.unexpected_attribute = True
+
+
+@pytest.mark.asyncio
+async def test_ollama_embeddings_are_cached(ollama_config, monkeypatch, tmp_path):
+    """Test that repeated texts are served from the persistent cache."""
+    monkeypatch.setenv("OLLAMA_EMBED_CACHE", str(tmp_path / "embeddings.sqlite"))
+    fetch = AsyncMock(return_value=[0.5, 0.25])
+
+    with patch.object(OllamaProvider, "_fetch_embedding", fetch):
+        provider = OllamaProvider(ollama_config)
+        assert (await provider.get_embeddings("cached text")).tolist() == [0.5, 0.25]
+
+        # A fresh provider reads the same database
+        provider = OllamaProvider(ollama_config)
+        cached = await provider.get_embeddings("cached text")
+        assert cached.dtype == np.float32
+        assert cached.tolist() == [0.5, 0.25]
+
+    fetch.assert_awaited_once_with("cached text")
+
+
+def test_embedding_cache_ttl():
+    """Test that expired cache entries are treated as misses."""
+    cache = EmbeddingCache(ttl=0.0)
+    key = embedding_cache_key("model", "text")
+    cache.put(key, [1.0])
+
+    assert cache.get(key) is None
+    assert EmbeddingCache().get(key) is None
+
+
+def test_embedding_cache_deletes_expired_entries():
+    """Test that expired entries are removed from the store, not just skipped."""
+    cache = EmbeddingCache(ttl=0.0)
+    key = embedding_cache_key("model", "text")
+    cache.put(key, [1.0])
+
+    assert cache._conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0] == 0
+
+
+def test_embedding_cache_evicts_oldest_entries():
+    """Test that the store keeps at most max_entries vectors, dropping the oldest."""
+    cache = EmbeddingCache(max_entries=2)
+    keys = [embedding_cache_key("model", str(i)) for i in range(3)]
+    with patch("agently.models.embedding_cache.time.time", side_effect=[1.0, 2.0, 3.0]):
+        for key in keys:
+            cache.put(key, [1.0])
+
+    assert cache.get(keys[0]) is None
+    assert cache.get(keys[1]) is not None
+    assert cache.get(keys[2]) is not None
+
+
+@pytest.mark.parametrize(
+    "env",
+    [
+        {"OLLAMA_EMBED_CACHE_TTL": "an hour"},
+        {"OLLAMA_EMBED_CACHE_MAX_ENTRIES": "lots"},
+        {"OLLAMA_EMBED_CACHE": "/dev/null/embeddings.sqlite"},
+    ],
+)
+@pytest.mark.asyncio
+async def test_ollama_invalid_embed_cache_falls_back(ollama_config, monkeypatch, env, caplog):
+    """Test that bad cache settings disable the cache instead of failing the provider."""
+    for name, value in env.items():
+        monkeypatch.setenv(name, value)
+
+    with patch.object(OllamaProvider, "_fetch_embedding", AsyncMock(return_value=[0.5])) as fetch:
+        provider = OllamaProvider(ollama_config)
+        assert provider._embed_cache is None
+        assert (await provider.get_embeddings("text")).tolist() == [0.5]
+        assert [v.tolist() for v in await provider.get_embeddings_batch(["text", "more"])] == [[0.5], [0.5]]
+
+    assert fetch.await_count == 3
+    assert "Embedding cache disabled" in caplog.text
+
+
+@pytest.mark.asyncio
+async def test_ollama_embeddings_batch(ollama_config):
+    """Test that batch requests only fetch uncached, unique texts."""
+    calls = []
+
+    async def fetch(self, text):
+        calls.append(text)
+        return [float(len(text))]
+
+    with patch.object(OllamaProvider, "_fetch_embedding", fetch):
+        provider = OllamaProvider(ollama_config)
+        assert (await provider.get_embeddings("a")).tolist() == [1.0]
+
+        embeddings = await provider.get_embeddings_batch(["a", "bb", "ccc", "bb"])
+
+    assert [embedding.tolist() for embedding in embeddings] == [[1.0], [2.0], [3.0], [2.0]]
+    assert sorted(calls) == ["a", "bb", "ccc"]
+
+
+@pytest.mark.asyncio
+async def test_ollama_session_is_reused(ollama_config):
+    """Test that embedding requests share one HTTP session per event loop."""
+    provider = OllamaProvider(ollama_config)
+
+    session = provider._get_session()
+    assert provider._get_session() is session
+
+    await provider.aclose()
+    assert session.closed
+    assert provider._get_session() is not session
+    await provider.aclose()
+
+
+def test_ollama_session_released_on_loop_change(ollama_config):
+    """Test that a session from a finished event loop is detached when the next loop replaces it."""
+    provider = OllamaProvider(ollama_config)
+
+    async def open_session():
+        return provider._get_session()
+
+    first = asyncio.run(open_session())
+    second = asyncio.run(open_session())
+
+    assert first.closed
+    assert first.connector is None
+    assert second is not first
+    asyncio.run(provider.aclose())
+    assert provider._session is None
+
+
+@pytest.mark.asyncio
+async def test_ollama_fetch_embedding(ollama_config, ollama_server):
+    """Test a round trip against the embeddings endpoint."""
+    provider = OllamaProvider(ollama_config)
+
+    try:
+        embeddings = await provider.get_embeddings_batch(["abc", "de"])
+    finally:
+        await provider.aclose()
+
+    assert all(embedding.dtype == np.float32 for embedding in embeddings)
+    assert [embedding.tolist() for embedding in embeddings] == [[3.0, 0.5], [2.0, 0.5]]
+    assert sorted(body["prompt"] for body in ollama_server) == ["abc", "de"]
+    assert all(body["model"] == "nomic-embed-text" for body in ollama_server)
+
+
+@pytest.mark.asyncio
+async def test_ollama_embedding_concurrency_is_bounded(ollama_config, monkeypatch):
+    """Test that the embedding semaphore honours OLLAMA_EMBED_CONCURRENCY."""
+    monkeypatch.setenv("OLLAMA_EMBED_CONCURRENCY", "2")
+    provider = OllamaProvider(ollama_config)
+
+    try:
+        provider._get_session()
+        assert provider._embed_semaphore._value == 2
+    finally:
+        await provider.aclose()
+
+
+@pytest.mark.asyncio
+async def test_ollama_embeddings_reject_empty_text(ollama_config):
+    """Test that empty input fails before any request is made."""
+    fetch = AsyncMock(return_value=[1.0])
+
+    with patch.object(OllamaProvider, "_fetch_embedding", fetch):
+        provider = OllamaProvider(ollama_config)
+        with pytest.raises(ModelError, match="empty text"):
+            await provider.get_embeddings("  \n")
+        with pytest.raises(ModelError, match=r"positions \[1\]"):
+            await provider.get_embeddings_batch(["a", ""])
+
+    fetch.assert_not_awaited()
+    assert provider._session is None
+
+
+def test_parse_embedding():
+    """Test parsing embeddings from raw response bodies."""
+    assert parse_embedding(b'{"embedding":[0.5,-1.25e1,3]}').tolist() == [0.5, -12.5, 3.0]
+    assert parse_embedding(b'{"model": "m", "embedding": [ 1.5 , 2 ]}').tolist() == [1.5, 2.0]
+    assert parse_embedding(b'{"embedding":[]}').size == 0
+    # Anything the fast path can't read goes through the JSON parser
+    assert parse_embedding(b'{"note": "\\"embedding\\":[", "embedding": [1, 2]}').tolist() == [1.0, 2.0]
+    # Bodies without a numeric embedding are errors, not zero vectors
+    for body in [b'{"error": null}', b"[1, 2]", b'{"embedding": "none"}', b'{"embedding": [null, "x"]}']:
+        with pytest.raises(ValueError):
+            parse_embedding(body)
+
+
+@pytest.mark.asyncio
+async def test_ollama_duplicate_fetches_share_one_request(ollama_config):
+    """Test that concurrent fetches of the same text are single-flighted."""
+    calls = []
+    release = asyncio.Event()
+
+    async def fetch(self, text):
+        calls.append(text)
+        await release.wait()
+        return [1.0]
+
+    with patch.object(OllamaProvider, "_fetch_embedding", fetch):
+        provider = OllamaProvider(ollama_config)
+        first = asyncio.ensure_future(provider._fetch_embedding_once("same"))
+        second = asyncio.ensure_future(provider._fetch_embedding_once("same"))
+        await asyncio.sleep(0)
+        release.set()
+        results = await asyncio.gather(first, second)
+
+    assert results == [[1.0], [1.0]]
+    assert calls == ["same"]
+    assert provider._inflight == {}
+
+
+@pytest.mark.asyncio
+async def test_ollama_permanent_errors_are_not_retried(ollama_config, ollama_server):
+    """Test that a client error fails after a single request."""
+    ollama_config.model = "missing-model"
+    provider = OllamaProvider(ollama_config)
+
+    try:
+        with pytest.raises(PermanentModelError):
+            await provider._fetch_embedding("abc")
+    finally:
+        await provider.aclose()
+
+    assert len(ollama_server) == 1
@@ -495,7 +495,7 @@ def test_initialize_plugins_with_mocking():
     # Mock YAML loading
     with patch("yaml.safe_load", return_value=yaml_content), \
          patch("builtins.open", MagicMock()), \
-         patch("json.dump") as mock_dump, \
+         patch("agently.cli.commands.write_lockfile") as mock_write, \
          patch("json.load") as mock_load, \
          patch("pathlib.Path.cwd") as mock_cwd, \
          patch("pathlib.Path.exists", return_value=True), \
@@ -515,13 +515,13 @@ def test_initialize_plugins_with_mocking():
         from agently.cli.commands import _initialize_plugins
         _initialize_plugins(mock_config_path, quiet=True)
         
-        # Verify json.dump was called 
-        assert mock_dump.call_count > 0
+        # Verify the lockfile was written
+        assert mock_write.call_count > 0
         
         # Extract the lockfile data that was saved
-        calls = mock_dump.call_args_list
+        calls = mock_write.call_args_list
         last_call = calls[-1]
-        lockfile_data = last_call[0][0]  # First argument to json.dump
+        lockfile_data = last_call[0][1]  # Second argument to write_lockfile
         
         # Verify the lockfile structure
         assert "plugins" in lockfile_data
@@ -546,4 +546,45 @@ def test_initialize_plugins_with_mocking():
                 "local/mcp-server": {"namespace": "local", "name": "mcp-server", "plugin_type": "mcp", "sha": "jkl012"},
                 "testuser/mcp-hello": {"namespace": "testuser", "name": "mcp-hello", "plugin_type": "mcp", "sha": "def456"},
             },
-        } 
\ No newline at end of file
+        } 
+
+def test_initialize_plugins_skips_unchanged_lockfile(tmp_path, monkeypatch):
+    """Test that an up-to-date lockfile isn't rewritten."""
+    monkeypatch.chdir(tmp_path)
+    config_path = tmp_path / "agently.yaml"
+    config_path.write_text('version: "1"\nname: "Test Agent"\n')
+    lockfile_path = tmp_path / "agently.lockfile.json"
+    lockfile_path.write_text(json.dumps({"plugins": {"sk": {}, "mcp": {}}}, indent=2))
+    os.utime(lockfile_path, ns=(0, 0))
+
+    _initialize_plugins(config_path, quiet=True)
+
+    assert lockfile_path.stat().st_mtime_ns == 0
+
+
+def test_initialize_plugins_replaces_corrupt_lockfile(tmp_path, monkeypatch):
+    """Test that an unparseable lockfile is rewritten even when the config has no plugins."""
+    monkeypatch.chdir(tmp_path)
+    config_path = tmp_path / "agently.yaml"
+    config_path.write_text('version: "1"\nname: "Test Agent"\n')
+    lockfile_path = tmp_path / "agently.lockfile.json"
+    lockfile_path.write_text("{not json")
+
+    _initialize_plugins(config_path, quiet=True)
+
+    assert json.loads(lockfile_path.read_text()) == {"plugins": {"sk": {}, "mcp": {}}}
+
+
+def test_initialize_plugins_writes_lockfile_atomically(tmp_path, monkeypatch):
+    """Test that the lockfile is written through a temporary file that replaces it."""
+    monkeypatch.chdir(tmp_path)
+    config_path = tmp_path / "agently.yaml"
+    config_path.write_text('version: "1"\nname: "Test Agent"\n')
+
+    with patch("agently.plugins.sources.os.replace", side_effect=os.replace) as mock_replace:
+        _initialize_plugins(config_path, quiet=True)
+
+    lockfile_path = tmp_path / "agently.lockfile.json"
+    assert mock_replace.call_args.args[1] == lockfile_path
+    assert json.loads(lockfile_path.read_text()) == {"plugins": {"sk": {}, "mcp": {}}}
+    assert sorted(path.name for path in tmp_path.iterdir()) == ["agently.lockfile.json", "agently.yaml"]